@@ -6,6 +6,32 @@ import json
 
 from truthscore import TruthScorer
 
+SUMMARY_KEYS = (
+    "truth_score",
+    "decision",
+    "unsupported_ratio",
+    "contradictions",
+    "consistency_score",
+    "linguistic_risk",
+    "emotional_intensity",
+    "coverage",
+    "evidence_score",
+)
+
+
+def _format_result(question, answer, r):
+    """Render one scored example as a single block of text."""
+    slim = {k: r[k] for k in SUMMARY_KEYS}
+    return "\n".join(
+        [
+            "=" * 60,
+            f"Q: {question}",
+            f"A: {answer}",
+            json.dumps(slim, indent=2),
+            f"claims: {[c['label'] for c in r['claims']]}",
+        ]
+    )
+
 
 def main():
     scorer = TruthScorer()
@@ -25,27 +51,12 @@ def main():
         ),
     ]
 
-    for question, answer in examples:
-        print("=" * 60)
-        print("Q:", question)
-        print("A:", answer)
-        r = scorer.score(question=question, answer=answer)
-        slim = {
-            k: r[k]
-            for k in (
-                "truth_score",
-                "decision",
-                "unsupported_ratio",
-                "contradictions",
-                "consistency_score",
-                "linguistic_risk",
-                "emotional_intensity",
-                "coverage",
-                "evidence_score",
-            )
-        }
-        print(json.dumps(slim, indent=2))
-        print("claims:", [c["label"] for c in r["claims"]])
+    questions = [question for question, _ in examples]
+    answers = [answer for _, answer in examples]
+    results = scorer.score_batch(questions, answers)
+
+    for question, answer, r in zip(questions, answers, results):
+        print(_format_result(question, answer, r))
 
 
 if __name__ == "__main__":
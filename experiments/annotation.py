@@ -8,9 +8,99 @@ Implements outcome categories for manual annotation:
 - Hedged but Incorrect
 """
 
-from typing import Dict, List, Optional
+import functools
+import re
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from enum import Enum
 
+from experiments.llm_cache import DiskCache, cache_key
+
+# Marker lists are scanned as plain substrings (case-insensitive), so each set is
+# compiled once into a single prefix-factored pattern and matched with one ``search``.
+# Matching uses re.IGNORECASE, so answers are never copied into lowercase.
+_HEDGING_MARKERS: FrozenSet[str] = frozenset({
+    "maybe", "perhaps", "possibly", "might", "could", "uncertain",
+    "unclear", "unknown", "probably", "likely", "seems", "appears",
+    "suggest", "indicate", "may", "not sure",
+})
+
+_REFUSAL_MARKERS: FrozenSet[str] = frozenset({
+    "cannot", "cannot provide", "unable to", "don't know",
+    "no information", "insufficient", "not confident",
+    "cannot answer", "unable to answer",
+})
+
+
+def _trie_pattern(markers: FrozenSet[str]) -> str:
+    """
+    Build a prefix-factored regex alternation from ``markers``.
+    
+    Shared prefixes are matched once (e.g. ``cannot(?: answer| provide)?``), so at
+    each start position the regex engine walks a trie instead of retrying every
+    marker from its first character. Branches are sorted, so the pattern does
+    not depend on set iteration order.
+    """
+    trie: Dict[str, dict] = {}
+    for marker in markers:
+        node = trie
+        for ch in marker:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        terminal = "" in node
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if terminal else group
+    
+    return build(trie)
+
+
+# Ground truth flagged as uncertain; matched case-insensitively without a lowered copy
+_UNKNOWN_RE = re.compile("unknown", re.IGNORECASE)
+
+# Answers shorter than the shortest marker cannot contain any marker
+_MIN_MARKER_LEN = min(len(marker) for marker in _HEDGING_MARKERS | _REFUSAL_MARKERS)
+
+_HEDGING_RE = re.compile(_trie_pattern(_HEDGING_MARKERS), re.IGNORECASE)
+_REFUSAL_RE = re.compile(_trie_pattern(_REFUSAL_MARKERS), re.IGNORECASE)
+
+# Refusals opening the answer in the first person, optionally after an apology
+# ("Sorry, I cannot ...", "I'm unable to ..."), spelled with single spaces and
+# straight apostrophes. Factual answers that merely contain or open with a
+# marker ("Vitamin C cannot ...", "Insufficient vitamin D ...") do not match,
+# unlike with ``_REFUSAL_RE``.
+_LEADING_REFUSALS: FrozenSet[str] = frozenset(
+    apology + subject + marker
+    for apology in ("", "sorry ", "sorry, ", "sorry. ", "sorry! ",
+                    "i'm sorry ", "i'm sorry, ", "i'm sorry. ", "i'm sorry! ")
+    for subject in ("i ", "i'm ", "i am ", "we ", "we're ", "we are ")
+    for marker in _REFUSAL_MARKERS
+)
+_LEADING_REFUSAL_RE = re.compile(_trie_pattern(_LEADING_REFUSALS))
+
+# Openings that could still grow into a leading refusal
+_LEADING_REFUSAL_PREFIXES: FrozenSet[str] = frozenset(
+    opening[:i] for opening in _LEADING_REFUSALS for i in range(len(opening))
+)
+
+# Both marker sets in one pattern, tagged by group name. The zero-width lookahead
+# lets ``finditer`` report a match at every position, so a hedge marker never
+# hides an overlapping refusal marker (and vice versa).
+_MARKER_RE = re.compile(
+    f"(?=(?P<hedge>{_trie_pattern(_HEDGING_MARKERS)})"
+    f"|(?P<refusal>{_trie_pattern(_REFUSAL_MARKERS)}))",
+    re.IGNORECASE,
+)
+
+
+# Inference configurations (result keys), in report order
+METHODS: Tuple[str, ...] = ("vanilla", "rag", "self_consistency", "truthscore")
+
 
 class OutcomeCategory(Enum):
     """Outcome categories for experiment responses."""
@@ -20,6 +110,109 @@ class OutcomeCategory(Enum):
     HEDGED_BUT_INCORRECT = "Hedged but Incorrect"
 
 
+# Detection is a pure function of the answer text, and the same answers recur
+# across inference configurations and experiment runs, so results are memoized.
+@functools.lru_cache(maxsize=8192)
+def detect_hedging(answer: str) -> bool:
+    """
+    Detect if answer contains hedging language.
+    
+    Args:
+        answer: The answer text
+    
+    Returns:
+        True if answer contains hedging markers
+    """
+    if not answer or len(answer) < _MIN_MARKER_LEN:
+        return False
+    return _HEDGING_RE.search(answer) is not None
+
+
+@functools.lru_cache(maxsize=8192)
+def detect_refusal(answer: str) -> bool:
+    """
+    Detect if answer is a refusal.
+    
+    Args:
+        answer: The answer text
+    
+    Returns:
+        True if answer appears to be a refusal
+    """
+    if not answer or len(answer) < _MIN_MARKER_LEN:
+        return False
+    return _REFUSAL_RE.search(answer) is not None
+
+
+@functools.lru_cache(maxsize=8192)
+def classify(answer: str) -> Tuple[bool, bool]:
+    """
+    Detect hedging and refusal in a single pass over the answer.
+    
+    Args:
+        answer: The answer text
+    
+    Returns:
+        (is_hedged, is_refusal), equal to
+        (detect_hedging(answer), detect_refusal(answer))
+    """
+    is_hedged = False
+    is_refusal = False
+    if not answer or len(answer) < _MIN_MARKER_LEN:
+        return is_hedged, is_refusal
+    for match in _MARKER_RE.finditer(answer):
+        if match.lastgroup == "hedge":
+            is_hedged = True
+        else:
+            is_refusal = True
+        if is_hedged and is_refusal:
+            break
+    return is_hedged, is_refusal
+
+
+def detect_leading_refusal(answer: str) -> Optional[bool]:
+    """
+    Detect if answer opens with a first-person refusal.
+    
+    Stricter than ``detect_refusal``, which matches a marker anywhere; meant
+    for deciding on a partial (streamed) answer. Not memoized, since partial
+    answers do not recur.
+    
+    Args:
+        answer: The answer text, or the part streamed so far
+    
+    Returns:
+        True if a refusal opens the answer, None if the text is still too short
+        to tell (it could grow into one), False otherwise
+    """
+    opening = " ".join(answer.split()).lower().replace("’", "'")
+    if _LEADING_REFUSAL_RE.match(opening):
+        return True
+    return None if opening in _LEADING_REFUSAL_PREFIXES else False
+
+
+# Outcome for every (is_correct, is_refusal, is_hedged) combination once the
+# ground-truth-dependent Correct Refusal case has been ruled out:
+# - Correct Answer: correct, confident, not a refusal
+# - Overconfident Error: wrong but confident, not a refusal
+# - Hedged but Incorrect: wrong but hedged
+# - Anything else defaults to Correct Answer (conservative)
+_OUTCOME_TABLE: Dict[Tuple[Optional[bool], bool, bool], OutcomeCategory] = {
+    (True, False, False): OutcomeCategory.CORRECT_ANSWER,
+    (True, False, True): OutcomeCategory.CORRECT_ANSWER,
+    (True, True, False): OutcomeCategory.CORRECT_ANSWER,
+    (True, True, True): OutcomeCategory.CORRECT_ANSWER,
+    (False, False, False): OutcomeCategory.OVERCONFIDENT_ERROR,
+    (False, False, True): OutcomeCategory.HEDGED_BUT_INCORRECT,
+    (False, True, False): OutcomeCategory.CORRECT_ANSWER,
+    (False, True, True): OutcomeCategory.HEDGED_BUT_INCORRECT,
+    (None, False, False): OutcomeCategory.CORRECT_ANSWER,
+    (None, False, True): OutcomeCategory.CORRECT_ANSWER,
+    (None, True, False): OutcomeCategory.CORRECT_ANSWER,
+    (None, True, True): OutcomeCategory.CORRECT_ANSWER,
+}
+
+
 class Annotator:
     """Helper class for manual annotation of experiment results."""
     
@@ -50,62 +243,118 @@ class Annotator:
         if is_refusal:
             # In real annotation, would check if refusal is appropriate
             # For now, assume refusal is correct if ground_truth indicates uncertainty
-            if ground_truth is None or "unknown" in ground_truth.lower():
+            if ground_truth is None or _UNKNOWN_RE.search(ground_truth):
                 return OutcomeCategory.CORRECT_REFUSAL
             # Could also be incorrect refusal, but defaulting to correct
         
-        # Correct Answer: Answer is correct and confident
-        if is_correct and not is_hedged and not is_refusal:
-            return OutcomeCategory.CORRECT_ANSWER
-        
-        # Overconfident Error: Answer is wrong but confident
-        if is_correct is False and not is_hedged and not is_refusal:
-            return OutcomeCategory.OVERCONFIDENT_ERROR
-        
-        # Hedged but Incorrect: Answer is wrong but hedged
-        if is_correct is False and is_hedged:
-            return OutcomeCategory.HEDGED_BUT_INCORRECT
-        
-        # Default: if unsure, return Correct Answer (conservative)
-        return OutcomeCategory.CORRECT_ANSWER
+        # Remaining outcomes depend only on the three flags
+        return _OUTCOME_TABLE.get(
+            (is_correct, bool(is_refusal), bool(is_hedged)), OutcomeCategory.CORRECT_ANSWER
+        )
+    
+    @staticmethod
+    def classify(answer: str) -> Tuple[bool, bool]:
+        """Detect hedging and refusal in a single pass (see ``classify``)."""
+        return classify(answer)
     
     @staticmethod
     def detect_hedging(answer: str) -> bool:
-        """
-        Detect if answer contains hedging language.
-        
-        Args:
-            answer: The answer text
-        
-        Returns:
-            True if answer contains hedging markers
-        """
-        hedging_markers = [
-            "maybe", "perhaps", "possibly", "might", "could", "uncertain",
-            "unclear", "unknown", "probably", "likely", "seems", "appears",
-            "suggest", "indicate", "may", "not sure", "uncertain"
-        ]
-        
-        answer_lower = answer.lower()
-        return any(marker in answer_lower for marker in hedging_markers)
+        """Detect if answer contains hedging language (see ``detect_hedging``)."""
+        return detect_hedging(answer)
     
     @staticmethod
     def detect_refusal(answer: str) -> bool:
-        """
-        Detect if answer is a refusal.
+        """Detect if answer is a refusal (see ``detect_refusal``)."""
+        return detect_refusal(answer)
+
+
+def summary_by_category(summary: Dict) -> Dict[str, Dict[str, int]]:
+    """
+    Transpose a summary's ``by_method`` counts into category -> method -> count.
+    
+    Args:
+        summary: Summary dictionary from ``summarize_results``
+    
+    Returns:
+        Counts keyed by outcome category, then by method
+    """
+    by_method = summary["by_method"]
+    return {
+        category.value: {method: counts[category.value] for method, counts in by_method.items()}
+        for category in OutcomeCategory
+    }
+
+
+def annotate_result(
+    result: Dict,
+    ground_truth: Dict[str, any],
+    annotator: Annotator,
+    cache: Optional[DiskCache] = None,
+    skip_empty: bool = False
+) -> Dict:
+    """
+    Annotate every method's answer in one experiment result.
+    
+    Module-level so that worker processes can unpickle it. With a ``cache``,
+    each (prompt, answer, ground truth) annotation is looked up before the
+    answer is scanned, and stored after.
+    
+    Args:
+        result: Result dictionary with a ``prompt`` and one entry per method
+        ground_truth: Dictionary mapping prompts to ground truth info
+        annotator: Annotator used to classify and categorize answers
+        cache: Optional persistent annotation cache
+        skip_empty: Leave methods with an empty answer unannotated
+    
+    Returns:
+        Copy of ``result`` with an ``annotations`` entry per method
+    """
+    prompt = result["prompt"]
+    gt_info = ground_truth.get(prompt, {})
+    gt_answer = gt_info.get("answer")
+    gt_is_correct = gt_info.get("is_correct")
+    
+    annotated_result = result.copy()
+    annotated_result["annotations"] = {}
+    
+    # Annotate each method
+    for method in METHODS:
+        answer = result[method]["answer"]
+        if skip_empty and not answer:
+            continue
         
-        Args:
-            answer: The answer text
+        key = None
+        if cache is not None:
+            key = cache_key(
+                kind="annotation",
+                prompt=prompt,
+                answer=answer,
+                ground_truth=gt_answer,
+                is_correct=gt_is_correct
+            )
+            annotation = cache.get(key)
+            if annotation is not None:
+                annotated_result["annotations"][method] = annotation
+                continue
         
-        Returns:
-            True if answer appears to be a refusal
-        """
-        refusal_markers = [
-            "cannot", "cannot provide", "unable to", "don't know",
-            "no information", "insufficient", "not confident",
-            "cannot answer", "unable to answer"
-        ]
+        is_hedged, is_refusal = annotator.classify(answer)
         
-        answer_lower = answer.lower()
-        return any(marker in answer_lower for marker in refusal_markers)
-
+        category = annotator.annotate(
+            prompt=prompt,
+            answer=answer,
+            ground_truth=gt_answer,
+            is_correct=gt_is_correct,
+            is_refusal=is_refusal,
+            is_hedged=is_hedged
+        )
+        
+        annotation = {
+            "category": category.value,
+            "is_refusal": is_refusal,
+            "is_hedged": is_hedged,
+        }
+        annotated_result["annotations"][method] = annotation
+        if key is not None:
+            cache.set(key, annotation)
+    
+    return annotated_result
@@ -8,22 +8,47 @@ Implements four inference configurations:
 4. Truth Score inference
 """
 
+import asyncio
+import functools
+import logging
 import os
-import time
-from typing import List, Dict, Optional
-from truthscore import TruthScorer
+import threading
+import warnings
+from collections import Counter
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional, Tuple
+from truthscore import TruthScorer, TfidfPassageRetriever
+from truthscore.default_corpus import DEFAULT_PASSAGES
+from truthscore.retrieve import EvidenceRetriever
+from experiments.annotation import detect_leading_refusal
+from experiments.llm_cache import DiskCache, cached
+from experiments.semantic_cache import SemanticCache
+from experiments.setup_api import get_client
+
+logger = logging.getLogger(__name__)
 
 try:
-    from openai import OpenAI
+    import openai  # noqa: F401
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
-    print("Warning: OpenAI package not installed. Install with: pip install openai")
+    warnings.warn(
+        "OpenAI package not installed. Install with: pip install openai",
+        ImportWarning,
+    )
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class InferenceConfig:
     """Base class for inference configurations."""
     
+    # Whether ``generate`` accepts a ``stop_on`` callback for streamed early exit
+    supports_streaming = False
+    
     def generate(self, prompt: str) -> Dict[str, any]:
         """
         Generate response for a given prompt.
@@ -32,76 +57,184 @@ class InferenceConfig:
             Dictionary with 'answer' and optional metadata
         """
         raise NotImplementedError
+    
+    def _cache_fields(self) -> Dict[str, any]:
+        """Request parameters that identify a cached response (see ``llm_cache.cached``)."""
+        return {
+            "model": getattr(self, "model_name", None),
+            "temperature": getattr(self, "temperature", None),
+            "max_tokens": _MAX_TOKENS
+        }
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        executor: Optional[Executor] = None
+    ) -> Dict[str, any]:
+        """
+        Asynchronous ``generate`` for running many prompts concurrently.
+        
+        The work is network-bound, so the blocking call runs in a thread pool;
+        callers bound concurrency with a semaphore, e.g.
+        ``asyncio.gather(*(bounded(p) for p in prompts))``.
+        
+        Args:
+            prompt: The question/prompt
+            executor: Thread pool to run in (default: the event loop's default
+                executor, which has only ``min(32, cpu_count() + 4)`` threads);
+                size it to the number of calls meant to be in flight
+        
+        Returns:
+            Dictionary with 'answer' and optional metadata
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(self.generate, prompt))
+
+
+_MAX_TOKENS = 200
+
+
+def _is_cacheable(result: Dict[str, any]) -> bool:
+    """Only real, complete (non-placeholder, non-error) responses are worth caching."""
+    return not (result.get("placeholder") or result.get("error") or result.get("stopped_early"))
 
 
 class VanillaLLM(InferenceConfig):
     """
     Vanilla LLM decoding - direct generation without augmentation.
     
-    Uses OpenAI API with GPT-4o-mini for real inference.
+    Uses OpenAI API with GPT-4o-mini for real inference. Responses are
+    streamed, so callers can stop generation early via ``stop_on``.
     """
     
-    def __init__(self, model_name: str = "gpt-4o-mini", api_key: Optional[str] = None):
+    supports_streaming = True
+    
+    def __init__(
+        self,
+        model_name: str = "gpt-4o-mini",
+        api_key: Optional[str] = None,
+        cache: Optional[SemanticCache] = None,
+        deterministic: bool = True,
+        response_cache: Optional[DiskCache] = None
+    ):
         """
         Initialize Vanilla LLM.
         
         Args:
             model_name: OpenAI model name (default: gpt-4o-mini)
             api_key: OpenAI API key (default: from OPENAI_API_KEY env var)
+            cache: Optional semantic cache reused for near-duplicate prompts
+            deterministic: Decode at temperature 0 and memoize completions per
+                prompt (default: True); False samples at temperature 0.7
+            response_cache: Optional persistent cache of API responses, keyed on
+                (model, prompt, temperature, max_tokens) and shared across runs;
+                only consulted for deterministic decoding
         """
         self.model_name = model_name
+        self.cache = cache
+        self.response_cache = response_cache
+        self.deterministic = deterministic
+        self.temperature = 0.0 if deterministic else 0.7
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         
         if OPENAI_AVAILABLE and self.api_key:
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = get_client(self.api_key)
         else:
             self.client = None
             if not OPENAI_AVAILABLE:
-                print("Warning: OpenAI package not installed. Using placeholder responses.")
+                logger.warning("OpenAI package not installed. Using placeholder responses.")
             elif not self.api_key:
-                print("Warning: OPENAI_API_KEY not set. Using placeholder responses.")
+                logger.warning("OPENAI_API_KEY not set. Using placeholder responses.")
+        
+        # Choose the placeholder or real path once rather than branching per call
+        self._generate = (
+            self._generate_real if self.client is not None else self._generate_placeholder
+        )
+        
+        # Greedy decoding makes completions a function of the prompt, so complete
+        # responses are memoized per prompt, whatever the caller's ``stop_on``
+        self._completions: Optional[Dict[str, Dict[str, any]]] = {} if deterministic else None
+        self._prompt_locks: Dict[str, threading.Lock] = {}
+        self._prompt_locks_guard = threading.Lock()
     
-    def generate(self, prompt: str) -> Dict[str, any]:
+    def generate(
+        self,
+        prompt: str,
+        stop_on: Optional[Callable[[str], Optional[bool]]] = None
+    ) -> Dict[str, any]:
         """
         Generate answer using vanilla LLM decoding.
         
+        Args:
+            prompt: The question/prompt
+            stop_on: Optional predicate over the answer streamed so far,
+                checked as each delta arrives until it returns True or False
+                (None means undecided); on True the stream is closed and the
+                partial answer is returned with ``stopped_early`` set (a
+                memoized complete answer is checked whole instead)
+        
         Returns real API response if available, otherwise placeholder.
         """
-        if self.client is None:
-            # Fallback to placeholder
-            return {
-                "answer": f"[PLACEHOLDER] This is a simulated vanilla LLM response to: {prompt}",
-                "method": "vanilla",
-                "model": self.model_name,
-                "placeholder": True
-            }
+        if self.cache is not None:
+            return self.cache.get_or_compute(
+                prompt, lambda: self._generate(prompt, stop_on), cacheable=_is_cacheable
+            )
+        return self._generate(prompt, stop_on)
+    
+    def _generate_placeholder(
+        self,
+        prompt: str,
+        stop_on: Optional[Callable[[str], Optional[bool]]] = None
+    ) -> Dict[str, any]:
+        """Fallback response used when no OpenAI client is available."""
+        return {
+            "answer": f"[PLACEHOLDER] This is a simulated vanilla LLM response to: {prompt}",
+            "method": "vanilla",
+            "model": self.model_name,
+            "placeholder": True
+        }
+    
+    def _generate_real(
+        self,
+        prompt: str,
+        stop_on: Optional[Callable[[str], Optional[bool]]] = None
+    ) -> Dict[str, any]:
+        """Generate answer with the OpenAI API, without consulting the semantic cache."""
+        if self._completions is None:
+            return self._request(prompt, stop_on)
+        
+        # Concurrent callers for one prompt (the vanilla and Truth Score legs)
+        # take turns, so the second one finds the first one's completion
+        with self._prompt_lock(prompt):
+            memo = self._completions.get(prompt)
+            if memo is None:
+                result = self._request(prompt, stop_on)
+                if _is_cacheable(result):
+                    self._completions[prompt] = result
+                    result = dict(result)
+                return result
         
+        # Callers get copies, so none of them can alter the memoized response
+        result = dict(memo)
+        if stop_on is not None and stop_on(result["answer"]):
+            result["stopped_early"] = True
+        return result
+    
+    def _prompt_lock(self, prompt: str) -> threading.Lock:
+        """Lock serializing completions of ``prompt``."""
+        with self._prompt_locks_guard:
+            return self._prompt_locks.setdefault(prompt, threading.Lock())
+    
+    def _request(
+        self,
+        prompt: str,
+        stop_on: Optional[Callable[[str], Optional[bool]]] = None
+    ) -> Dict[str, any]:
+        """Stream one completion, turning API errors into an error response."""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that provides accurate, factual answers."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=200
-            )
-            
-            answer = response.choices[0].message.content
-            
-            return {
-                "answer": answer,
-                "method": "vanilla",
-                "model": self.model_name,
-                "placeholder": False,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                }
-            }
+            return self._complete(prompt, stop_on)
         except Exception as e:
-            print(f"Error calling OpenAI API: {e}")
+            logger.error("Error calling OpenAI API: %s", e)
             return {
                 "answer": f"[ERROR] Failed to generate response: {str(e)}",
                 "method": "vanilla",
@@ -109,6 +242,75 @@ class VanillaLLM(InferenceConfig):
                 "error": str(e),
                 "placeholder": True
             }
+    
+    @cached(cacheable=_is_cacheable)
+    def _complete(
+        self,
+        prompt: str,
+        stop_on: Optional[Callable[[str], Optional[bool]]] = None
+    ) -> Dict[str, any]:
+        """Stream one completion; API errors propagate so they are never memoized."""
+        stream = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant that provides accurate, factual answers."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=_MAX_TOKENS,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        parts = []
+        usage = None
+        stopped_early = False
+        decided = stop_on is None
+        for chunk in stream:
+            # Usage arrives on the final chunk, which has no choices
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                # stop_on only runs while the opening is undecided, i.e. while
+                # the answer is still short, so streaming stays linear in length
+                if not decided:
+                    verdict = stop_on("".join(parts))
+                    decided = verdict is not None
+                    if verdict:
+                        # Close the connection instead of decoding the remaining tokens
+                        stream.close()
+                        stopped_early = True
+                        break
+        
+        answer = "".join(parts)
+        
+        return {
+            "answer": answer,
+            "method": "vanilla",
+            "model": self.model_name,
+            "placeholder": False,
+            "stopped_early": stopped_early,
+            "usage": {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens
+            } if usage is not None else None
+        }
+
+
+_RAG_SYSTEM_PROMPT = """You are a helpful assistant that answers questions based on the provided context. 
+If the context doesn't contain enough information to answer the question, say so."""
+
+_RAG_USER_TEMPLATE = """Context:
+{context}
+
+Question: {prompt}
+
+Answer based on the context above:"""
 
 
 class RAG(InferenceConfig):
@@ -116,97 +318,89 @@ class RAG(InferenceConfig):
     Retrieval-Augmented Generation.
     
     Retrieves relevant documents and conditions LLM generation on them.
-    Note: This is a simplified RAG implementation. For production, integrate
-    with a vector database (Pinecone, Weaviate, etc.).
+    Any ``truthscore`` evidence retriever can be used; for embedding search over
+    a larger corpus pass ``build_faiss_retriever(passages)``, which indexes the
+    precomputed, normalized passage embeddings once and answers each query with
+    a single inner-product search.
     """
     
-    def __init__(self, model_name: str = "gpt-4o-mini", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: str = "gpt-4o-mini",
+        api_key: Optional[str] = None,
+        retriever: Optional[EvidenceRetriever] = None,
+        top_k: int = 3,
+        deterministic: bool = True,
+        response_cache: Optional[DiskCache] = None
+    ):
         """
         Initialize RAG.
         
         Args:
             model_name: OpenAI model name (default: gpt-4o-mini)
             api_key: OpenAI API key (default: from OPENAI_API_KEY env var)
+            retriever: Evidence retriever (default: TF-IDF over DEFAULT_PASSAGES)
+            top_k: Number of passages to condition on (default: 3)
+            deterministic: Decode at temperature 0 and memoize completions per
+                prompt (default: True); False samples at temperature 0.7
+            response_cache: Optional persistent cache of API responses, keyed on
+                the rendered prompt (question and retrieved context); only
+                consulted for deterministic decoding
         """
         self.model_name = model_name
+        self.response_cache = response_cache
+        self.deterministic = deterministic
+        self.temperature = 0.0 if deterministic else 0.7
+        self.retriever = retriever or TfidfPassageRetriever(DEFAULT_PASSAGES)
+        self.top_k = top_k
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         
         if OPENAI_AVAILABLE and self.api_key:
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = get_client(self.api_key)
         else:
             self.client = None
+        
+        # Choose the placeholder or real path once rather than branching per call
+        self.generate = (
+            self._generate_real if self.client is not None else self._generate_placeholder
+        )
+        
+        # Greedy decoding makes completions a function of the prompt, so complete
+        # responses are memoized per prompt, whatever the caller's ``stop_on``
+        self._completions: Optional[Dict[str, Dict[str, any]]] = {} if deterministic else None
+        self._prompt_locks: Dict[str, threading.Lock] = {}
+        self._prompt_locks_guard = threading.Lock()
     
     def _retrieve_documents(self, query: str, top_k: int = 3) -> List[str]:
         """
         Retrieve relevant documents for a query.
         
-        Placeholder implementation - replace with actual vector search.
+        Returns the passage texts of the retriever's top-k hits.
         """
-        # TODO: Integrate with vector database
-        # For now, return placeholder documents
-        return [
-            f"Document 1 related to: {query}",
-            f"Document 2 related to: {query}",
-            f"Document 3 related to: {query}",
-        ]
+        hits = self.retriever.retrieve(query, top_k)
+        return [doc["text"] for doc in hits if doc.get("text")]
     
-    def generate(self, prompt: str) -> Dict[str, any]:
+    def _generate_placeholder(self, prompt: str) -> Dict[str, any]:
+        """Fallback response used when no OpenAI client is available."""
+        retrieved_docs = self._retrieve_documents(prompt, top_k=self.top_k)
+        return {
+            "answer": f"[PLACEHOLDER] RAG response to: {prompt} (with {len(retrieved_docs)} retrieved docs)",
+            "method": "rag",
+            "model": self.model_name,
+            "retrieved_docs": len(retrieved_docs),
+            "placeholder": True
+        }
+    
+    def _generate_real(self, prompt: str) -> Dict[str, any]:
         """
         Generate answer using RAG.
         
         Retrieves documents and conditions LLM generation on them.
         """
-        # Retrieve relevant documents
-        retrieved_docs = self._retrieve_documents(prompt, top_k=3)
-        context = "\n\n".join([f"- {doc}" for doc in retrieved_docs])
-        
-        if self.client is None:
-            return {
-                "answer": f"[PLACEHOLDER] RAG response to: {prompt} (with {len(retrieved_docs)} retrieved docs)",
-                "method": "rag",
-                "model": self.model_name,
-                "retrieved_docs": len(retrieved_docs),
-                "placeholder": True
-            }
-        
         try:
-            # Format prompt with context
-            system_prompt = """You are a helpful assistant that answers questions based on the provided context. 
-If the context doesn't contain enough information to answer the question, say so."""
-            
-            user_prompt = f"""Context:
-{context}
-
-Question: {prompt}
-
-Answer based on the context above:"""
-            
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=200
-            )
-            
-            answer = response.choices[0].message.content
-            
-            return {
-                "answer": answer,
-                "method": "rag",
-                "model": self.model_name,
-                "retrieved_docs": len(retrieved_docs),
-                "placeholder": False,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                }
-            }
+            return self._complete(prompt)
         except Exception as e:
-            print(f"Error calling OpenAI API for RAG: {e}")
+            logger.error("Error calling OpenAI API for RAG: %s", e)
             return {
                 "answer": f"[ERROR] Failed to generate RAG response: {str(e)}",
                 "method": "rag",
@@ -214,6 +408,52 @@ Answer based on the context above:"""
                 "error": str(e),
                 "placeholder": True
             }
+    
+    def _complete(self, prompt: str) -> Dict[str, any]:
+        """Retrieve and complete once; API errors propagate so they are never memoized."""
+        # Retrieve relevant documents
+        retrieved_docs = self._retrieve_documents(prompt, top_k=self.top_k)
+        context = "\n\n".join(f"- {doc}" for doc in retrieved_docs)
+        
+        # Format prompt with context
+        user_prompt = _RAG_USER_TEMPLATE.format_map({"context": context, "prompt": prompt})
+        completion = self._chat(user_prompt)
+        
+        return {
+            "answer": completion["answer"],
+            "method": "rag",
+            "model": self.model_name,
+            "retrieved_docs": len(retrieved_docs),
+            "placeholder": False,
+            "usage": completion["usage"]
+        }
+    
+    @cached()
+    def _chat(self, user_prompt: str) -> Dict[str, any]:
+        """
+        Complete a rendered RAG prompt.
+        
+        Cached on the rendered prompt, so the retriever, ``top_k`` and the
+        retrieved context are all part of the response cache key.
+        """
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[
+                {"role": "system", "content": _RAG_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=_MAX_TOKENS
+        )
+        
+        return {
+            "answer": response.choices[0].message.content,
+            "usage": {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens
+            }
+        }
 
 
 class SelfConsistency(InferenceConfig):
@@ -223,7 +463,15 @@ class SelfConsistency(InferenceConfig):
     Generates multiple answers and selects the most consistent one.
     """
     
-    def __init__(self, num_samples: int = 5, model_name: str = "gpt-4o-mini", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        num_samples: int = 5,
+        model_name: str = "gpt-4o-mini",
+        api_key: Optional[str] = None,
+        embedding_model: str = "text-embedding-3-small",
+        similarity_threshold: float = 0.88,
+        response_cache: Optional[DiskCache] = None
+    ):
         """
         Initialize Self-Consistency.
         
@@ -231,77 +479,161 @@ class SelfConsistency(InferenceConfig):
             num_samples: Number of samples to generate (default: 5)
             model_name: OpenAI model name (default: gpt-4o-mini)
             api_key: OpenAI API key (default: from OPENAI_API_KEY env var)
+            embedding_model: Embedding model used to cluster samples
+            similarity_threshold: Cosine similarity above which two samples agree
+            response_cache: Optional persistent cache of individual samples
         """
         self.num_samples = num_samples
         self.model_name = model_name
+        self.temperature = 0.8  # Higher temperature for diversity
+        self.response_cache = response_cache
+        self.embedding_model = embedding_model
+        self.similarity_threshold = similarity_threshold
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         
         if OPENAI_AVAILABLE and self.api_key:
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = get_client(self.api_key)
         else:
             self.client = None
+        
+        # Choose the placeholder or real path once rather than branching per call
+        self.generate = (
+            self._generate_real if self.client is not None else self._generate_placeholder
+        )
     
-    def _compute_agreement(self, samples: List[str]) -> Dict[str, int]:
+    def _compute_agreement(self, samples: List[str]) -> Counter:
         """
         Compute agreement between samples.
         
-        Simple implementation: counts exact matches.
-        In production, could use semantic similarity.
+        Simple implementation: counts exact matches. Used as the fallback when
+        samples cannot be clustered by embedding similarity.
         """
         # Count exact matches
-        from collections import Counter
-        return dict(Counter(samples))
+        return Counter(samples)
     
-    def generate(self, prompt: str) -> Dict[str, any]:
+    def _select_by_embedding(self, samples: List[str]) -> Optional[Tuple[str, float]]:
         """
-        Generate answer using self-consistency sampling.
+        Select the medoid of the largest semantic cluster of samples.
         
-        Generates multiple samples and selects the most consistent one.
+        Free-form samples rarely match exactly, so samples are embedded in a
+        single request and linked when their cosine similarity exceeds
+        ``similarity_threshold``. The largest connected component is the
+        majority meaning; its medoid is returned with the cluster's share of
+        samples as the agreement score.
+        
+        Returns:
+            (selected_answer, agreement_score), or None if NumPy is unavailable
+            or the embedding request fails
         """
-        if self.client is None:
-            samples = [
-                f"[PLACEHOLDER] Sample {i} answer to: {prompt}"
-                for i in range(self.num_samples)
-            ]
-            return {
-                "answer": samples[0],
-                "method": "self_consistency",
-                "model": self.model_name,
-                "samples": samples,
-                "num_samples": self.num_samples,
-                "placeholder": True
+        if np is None:
+            return None
+        
+        try:
+            response = self.client.embeddings.create(input=samples, model=self.embedding_model)
+        except Exception as e:
+            logger.warning("Error embedding self-consistency samples, falling back to exact match: %s", e)
+            return None
+        
+        embeddings = np.asarray([item.embedding for item in response.data], dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.maximum(norms, 1e-12)
+        similarity = embeddings @ embeddings.T
+        adjacent = similarity > self.similarity_threshold
+        
+        # Largest connected component of the agreement graph
+        unseen = set(range(len(samples)))
+        largest: List[int] = []
+        while unseen:
+            stack = [unseen.pop()]
+            component = []
+            while stack:
+                i = stack.pop()
+                component.append(i)
+                for j in np.flatnonzero(adjacent[i]):
+                    j = int(j)
+                    if j in unseen:
+                        unseen.remove(j)
+                        stack.append(j)
+            if len(component) > len(largest):
+                largest = component
+        
+        within = similarity[np.ix_(largest, largest)].sum(axis=1)
+        medoid = largest[int(np.argmax(within))]
+        return samples[medoid], len(largest) / len(samples)
+    
+    def _generate_placeholder(self, prompt: str) -> Dict[str, any]:
+        """Fallback response used when no OpenAI client is available."""
+        samples = [
+            f"[PLACEHOLDER] Sample {i} answer to: {prompt}"
+            for i in range(self.num_samples)
+        ]
+        return {
+            "answer": samples[0],
+            "method": "self_consistency",
+            "model": self.model_name,
+            "samples": samples,
+            "num_samples": self.num_samples,
+            "placeholder": True
+        }
+    
+    @cached(stochastic=True)
+    def _sample(self, prompt: str, index: int) -> Dict[str, any]:
+        """
+        Draw one high-temperature sample; returns its answer and token usage.
+        
+        ``index`` distinguishes the draws of one prompt so that each is cached
+        separately.
+        """
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=_MAX_TOKENS
+        )
+        return {
+            "answer": response.choices[0].message.content,
+            "usage": {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens
             }
+        }
+    
+    def _generate_real(self, prompt: str) -> Dict[str, any]:
+        """
+        Generate answer using self-consistency sampling.
         
+        Generates multiple samples and selects the most consistent one.
+        """
         try:
-            samples = []
-            total_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+            # Samples are independent network calls: submit them all, then collect
+            # in a second pass so latency is ~one round-trip instead of N.
+            with ThreadPoolExecutor(max_workers=self.num_samples) as executor:
+                futures = [
+                    executor.submit(self._sample, prompt, i)
+                    for i in range(self.num_samples)
+                ]
+                drawn = [future.result() for future in futures]
+            
+            samples = [sample["answer"] for sample in drawn]
             
-            # Generate multiple samples with higher temperature
-            for i in range(self.num_samples):
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.8,  # Higher temperature for diversity
-                    max_tokens=200
-                )
-                
-                answer = response.choices[0].message.content
-                samples.append(answer)
-                
-                # Accumulate usage
-                total_usage["prompt_tokens"] += response.usage.prompt_tokens
-                total_usage["completion_tokens"] += response.usage.completion_tokens
-                total_usage["total_tokens"] += response.usage.total_tokens
-                
-                # Small delay to avoid rate limits
-                time.sleep(0.1)
+            # Accumulate usage
+            total_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+            for sample in drawn:
+                for field in total_usage:
+                    total_usage[field] += sample["usage"][field]
             
-            # Compute agreement and select most common answer
+            # Select the majority meaning; fall back to the most common exact answer
             agreement = self._compute_agreement(samples)
-            selected_answer = max(agreement.items(), key=lambda x: x[1])[0]
+            selection = self._select_by_embedding(samples)
+            if selection is not None:
+                selected_answer, agreement_score = selection
+            else:
+                selected_answer, count = agreement.most_common(1)[0]
+                agreement_score = count / len(samples)
             
             return {
                 "answer": selected_answer,
@@ -309,12 +641,13 @@ class SelfConsistency(InferenceConfig):
                 "model": self.model_name,
                 "samples": samples,
                 "num_samples": self.num_samples,
-                "agreement": agreement,
+                "agreement": dict(agreement),
+                "agreement_score": agreement_score,
                 "placeholder": False,
                 "usage": total_usage
             }
         except Exception as e:
-            print(f"Error calling OpenAI API for Self-Consistency: {e}")
+            logger.error("Error calling OpenAI API for Self-Consistency: %s", e)
             return {
                 "answer": f"[ERROR] Failed to generate self-consistency response: {str(e)}",
                 "method": "self_consistency",
@@ -324,6 +657,9 @@ class SelfConsistency(InferenceConfig):
             }
 
 
+_REFUSAL_ANSWER = "I cannot provide a confident answer to this question based on available evidence."
+
+
 class TruthScoreInference(InferenceConfig):
     """
     Truth Score inference.
@@ -331,16 +667,23 @@ class TruthScoreInference(InferenceConfig):
     Uses TruthScore to evaluate and filter/refuse answers based on evidence.
     """
     
-    def __init__(self, base_config: InferenceConfig, scorer: Optional[TruthScorer] = None):
+    def __init__(
+        self,
+        base_config: InferenceConfig,
+        scorer: Optional[TruthScorer] = None,
+        cache: Optional[SemanticCache] = None
+    ):
         """
         Initialize Truth Score inference wrapper.
         
         Args:
             base_config: Base inference configuration (VanillaLLM, RAG, etc.)
             scorer: TruthScorer instance (creates default if None)
+            cache: Optional semantic cache holding full (answer + score) results
         """
         self.base_config = base_config
         self.scorer = scorer if scorer is not None else TruthScorer()
+        self.cache = cache
     
     def generate(self, prompt: str) -> Dict[str, any]:
         """
@@ -349,17 +692,57 @@ class TruthScoreInference(InferenceConfig):
         Returns answer only if TruthScore decision is ACCEPT or QUALIFIED.
         Otherwise returns a refusal.
         """
-        # Generate answer using base configuration
-        base_result = self.base_config.generate(prompt)
+        if self.cache is not None:
+            return self.cache.get_or_compute(
+                prompt, lambda: self._generate(prompt), cacheable=_is_cacheable
+            )
+        return self._generate(prompt)
+    
+    def _generate(self, prompt: str) -> Dict[str, any]:
+        """Generate and score an answer without consulting the cache."""
+        # Generate answer using base configuration; streaming bases stop as soon
+        # as the answer opens with a refusal, anything else is scored in full
+        if self.base_config.supports_streaming:
+            base_result = self.base_config.generate(prompt, stop_on=detect_leading_refusal)
+        else:
+            base_result = self.base_config.generate(prompt)
         answer = base_result["answer"]
         
+        # Placeholder or failed generations have nothing real to score
+        if base_result.get("placeholder") or base_result.get("error"):
+            result = {
+                "answer": answer,
+                "method": "truthscore",
+                "base_method": base_result.get("method", "unknown"),
+                "truth_score": None,
+                "decision": None,
+                "refused": False,
+                "score_details": None,
+                "placeholder": True
+            }
+            if base_result.get("error"):
+                result["error"] = base_result["error"]
+            return result
+        
+        # The base model already refused: nothing to score
+        if base_result.get("stopped_early"):
+            return {
+                "answer": _REFUSAL_ANSWER,
+                "method": "truthscore",
+                "base_method": base_result.get("method", "unknown"),
+                "truth_score": None,
+                "decision": "REFUSE",
+                "refused": True,
+                "score_details": None
+            }
+        
         # Evaluate with TruthScore
         score_result = self.scorer.score(question=prompt, answer=answer)
         
         # Decision logic: refuse if REFUSE, otherwise return answer
         if score_result["decision"] == "REFUSE":
             return {
-                "answer": f"I cannot provide a confident answer to this question based on available evidence.",
+                "answer": _REFUSAL_ANSWER,
                 "method": "truthscore",
                 "base_method": base_result.get("method", "unknown"),
                 "truth_score": score_result["truth_score"],
@@ -0,0 +1,52 @@
+"""
+JSON reading and writing for experiment inputs and results.
+
+Uses ``orjson`` when it is installed and falls back to the standard library
+``json`` module otherwise; both produce the same documents.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize ``obj`` to UTF-8 encoded JSON.
+
+    Args:
+        obj: JSON-serializable value
+        indent: Pretty-print with two-space indentation (default: False)
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        # Like ``json``, write non-string keys (e.g. a None answer) as strings
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump(obj: Any, path: Union[str, Path], indent: bool = True) -> None:
+    """Write ``obj`` to ``path`` as JSON (indented by default)."""
+    with open(path, 'wb') as f:
+        f.write(dumps(obj, indent=indent))
+
+
+def load(path: Union[str, Path]) -> Any:
+    """Read a JSON document from ``path``."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
@@ -0,0 +1,148 @@
+"""
+Persistent response cache for experiment LLM calls.
+
+Responses are stored in a local SQLite database keyed by a hash of the request
+parameters, so re-running an experiment replays already-seen requests without
+any network I/O. One ``DiskCache`` can be shared by every inference
+configuration; ``cached`` wires it into the methods that hit the network.
+"""
+
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_CACHE_PATH = "experiments/.cache/llm_cache.sqlite"
+
+
+def cache_key(**fields: Any) -> str:
+    """
+    Hash request parameters into a cache key.
+
+    Args:
+        **fields: JSON-serializable request parameters (model, prompt, temperature, ...)
+
+    Returns:
+        Hex digest of the canonical (sorted-key) JSON encoding
+    """
+    payload = json.dumps(fields, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class DiskCache:
+    """Key/value store for JSON-serializable values backed by SQLite."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Open (or create) a cache database.
+
+        Args:
+            path: SQLite file location (default: experiments/.cache/llm_cache.sqlite)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def get(self, key: str, default: Optional[Any] = None) -> Optional[Any]:
+        """Return the value stored under ``key``, or ``default``."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return json.loads(row[0]) if row is not None else default
+
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``, replacing any previous value."""
+        encoded = json.dumps(value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)", (key, encoded)
+            )
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Lookup counters since the cache was opened."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def __getstate__(self) -> Dict[str, str]:
+        # Pickled by path so that worker processes open their own connection
+        return {"path": str(self.path)}
+
+    def __setstate__(self, state: Dict[str, str]) -> None:
+        self.__init__(state["path"])
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def cached(cacheable: Optional[Callable[[Any], bool]] = None, stochastic: bool = False):
+    """
+    Cache a network-bound inference method in ``self.response_cache``.
+
+    The decorated method must take the prompt as its first argument and return
+    a JSON-serializable result. The key hashes the method's qualified name, the
+    prompt, any scalar positional arguments (callbacks such as ``stop_on`` are
+    not part of the key), and ``self._cache_fields()`` (model, temperature, ...).
+    Without a ``response_cache``, or when the config samples at a temperature
+    above 0, the method runs uncached so that reruns draw fresh samples.
+
+    Args:
+        cacheable: Optional predicate; results failing it are not stored
+        stochastic: Cache even at temperature > 0, for methods whose arguments
+            already identify one particular draw (e.g. a sample index)
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, prompt: str, *args: Any) -> Any:
+            cache: Optional[DiskCache] = getattr(self, "response_cache", None)
+            if cache is None:
+                return method(self, prompt, *args)
+            fields = self._cache_fields()
+            if fields.get("temperature") and not stochastic:
+                return method(self, prompt, *args)
+
+            key = cache_key(
+                method=method.__qualname__,
+                prompt=prompt,
+                args=[a for a in args if isinstance(a, (str, int, float))],
+                **fields
+            )
+            value = cache.get(key)
+            if value is not None:
+                return value
+
+            value = method(self, prompt, *args)
+            if cacheable is None or cacheable(value):
+                cache.set(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -8,34 +8,53 @@ Runs experiments comparing four inference configurations:
 4. Truth Score inference
 """
 
-import json
-from typing import List, Dict
+import asyncio
+import functools
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Optional, Sequence
 from pathlib import Path
 
 from experiments.prompts import ALL_PROMPTS, PROMPT_CATEGORIES
 from experiments.inference_configs import (
     VanillaLLM, RAG, SelfConsistency, TruthScoreInference
 )
-from experiments.annotation import OutcomeCategory, Annotator
+from experiments.annotation import METHODS, OutcomeCategory, Annotator, annotate_result
+from experiments import jsonio
+from experiments.llm_cache import DiskCache
+
+
+# Outcome categories, in report order
+_CATEGORIES = tuple(cat.value for cat in OutcomeCategory)
 
 
 class ExperimentRunner:
     """Main experiment runner."""
     
-    def __init__(self, output_dir: str = "experiments/results"):
+    def __init__(
+        self,
+        output_dir: str = "experiments/results",
+        response_cache: Optional[DiskCache] = None,
+        annotation_cache: Optional[DiskCache] = None
+    ):
         """
         Initialize experiment runner.
         
         Args:
             output_dir: Directory to save results
+            response_cache: Optional persistent LLM response cache shared by
+                all inference configurations
+            annotation_cache: Optional persistent cache of per-answer annotations
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.response_cache = response_cache
+        self.annotation_cache = annotation_cache
         
         # Initialize inference configurations
-        self.vanilla = VanillaLLM()
-        self.rag = RAG()
-        self.self_consistency = SelfConsistency(num_samples=5)
+        self.vanilla = VanillaLLM(response_cache=response_cache)
+        self.rag = RAG(response_cache=response_cache)
+        self.self_consistency = SelfConsistency(num_samples=5, response_cache=response_cache)
         
         # Truth Score inference wraps vanilla LLM by default
         self.truthscore = TruthScoreInference(self.vanilla)
@@ -52,44 +71,166 @@ class ExperimentRunner:
         Returns:
             Dictionary with results from all configurations
         """
-        results = {
-            "prompt": prompt,
-            "vanilla": self.vanilla.generate(prompt),
-            "rag": self.rag.generate(prompt),
-            "self_consistency": self.self_consistency.generate(prompt),
-            "truthscore": self.truthscore.generate(prompt),
-        }
+        # The configurations are independent network calls: submit all of them
+        # first, then collect, so the prompt costs one round-trip, not four
+        with ThreadPoolExecutor(max_workers=len(METHODS)) as executor:
+            futures = {
+                method: executor.submit(getattr(self, method).generate, prompt)
+                for method in METHODS
+            }
+            results = {"prompt": prompt}
+            for method in METHODS:
+                results[method] = futures[method].result()
         
         return results
     
-    def run_all_prompts(self, prompts: List[str] = None) -> List[Dict]:
+    async def arun_single_prompt(
+        self,
+        prompt: str,
+        executor: Optional[Executor] = None
+    ) -> Dict:
+        """
+        Asynchronously run all inference configurations on a single prompt.
+        
+        Args:
+            prompt: The question/prompt to evaluate
+            executor: Thread pool the blocking calls run in (default: the
+                event loop's default executor)
+        
+        Returns:
+            Dictionary with results from all configurations
+        """
+        outputs = await asyncio.gather(
+            *(getattr(self, method).agenerate(prompt, executor) for method in METHODS)
+        )
+        results = {"prompt": prompt}
+        results.update(zip(METHODS, outputs))
+        return results
+    
+    async def arun_all_prompts(
+        self,
+        prompts: Sequence[str] = None,
+        concurrency: int = 16,
+        checkpoint: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Asynchronously run the experiment with bounded concurrency.
+        
+        Args:
+            prompts: Prompts to evaluate (uses ALL_PROMPTS if None)
+            concurrency: Maximum number of prompts in flight (default: 16)
+            checkpoint: Optional JSON-lines file in ``output_dir``; each result
+                is appended and flushed as soon as it completes, and prompts
+                already present in the file are not re-run
+        
+        Returns:
+            List of results dictionaries, in prompt order
+        """
+        if prompts is None:
+            prompts = ALL_PROMPTS
+        
+        done: Dict[str, Dict] = {}
+        if checkpoint is not None:
+            done = {result["prompt"]: result for result in self.load_results(checkpoint)}
+            if done:
+                print(f"Resuming: {len(done)} prompts already in {checkpoint}")
+        pending = [prompt for prompt in dict.fromkeys(prompts) if prompt not in done]
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        completed = 0
+        
+        async def worker(prompt: str, sink) -> None:
+            nonlocal completed
+            async with semaphore:
+                result = await self.arun_single_prompt(prompt, executor)
+            done[prompt] = result
+            if sink is not None:
+                sink.write(jsonio.dumps(result) + b"\n")
+                sink.flush()
+            completed += 1
+            print(f"Processed prompt {completed}/{len(pending)}: {prompt[:50]}...")
+        
+        # One thread per in-flight call: the loop's default executor is far
+        # smaller than concurrency * len(METHODS)
+        with ThreadPoolExecutor(max_workers=concurrency * len(METHODS)) as executor:
+            if checkpoint is None:
+                await asyncio.gather(*(worker(prompt, None) for prompt in pending))
+            else:
+                filepath = self.output_dir / checkpoint
+                with open(filepath, 'a+b') as sink:
+                    # Terminate a line truncated by an interrupted run
+                    if sink.tell():
+                        sink.seek(-1, 2)
+                        if sink.read(1) != b"\n":
+                            sink.write(b"\n")
+                    await asyncio.gather(*(worker(prompt, sink) for prompt in pending))
+        
+        return [done[prompt] for prompt in prompts]
+    
+    def run_all_prompts(
+        self,
+        prompts: Sequence[str] = None,
+        concurrency: int = 16,
+        checkpoint: Optional[str] = None
+    ) -> List[Dict]:
         """
         Run experiment on all prompts.
         
+        Prompts are processed concurrently (up to ``concurrency`` at a time);
+        from inside a running event loop use ``arun_all_prompts`` instead.
+        
         Args:
             prompts: List of prompts (uses ALL_PROMPTS if None)
+            concurrency: Maximum number of prompts in flight (default: 16)
+            checkpoint: Optional JSON-lines file in ``output_dir`` that results
+                are streamed to and resumed from
         
         Returns:
             List of results dictionaries
         """
-        if prompts is None:
-            prompts = ALL_PROMPTS
+        return asyncio.run(self.arun_all_prompts(prompts, concurrency, checkpoint))
+    
+    def load_results(self, filename: str = "experiment_results.jsonl") -> List[Dict]:
+        """
+        Load results streamed to a JSON-lines checkpoint.
         
-        results = []
-        for i, prompt in enumerate(prompts, 1):
-            print(f"Processing prompt {i}/{len(prompts)}: {prompt[:50]}...")
-            result = self.run_single_prompt(prompt)
-            results.append(result)
+        A truncated final line (from an interrupted run) is ignored.
+        
+        Args:
+            filename: Checkpoint file in ``output_dir``
+        
+        Returns:
+            List of results dictionaries, in completion order (empty if the
+            file does not exist)
+        """
+        filepath = self.output_dir / filename
+        if not filepath.exists():
+            return []
         
+        results = []
+        with open(filepath, 'rb') as f:
+            for line in f:
+                try:
+                    results.append(jsonio.loads(line))
+                except ValueError:
+                    continue
         return results
     
-    def annotate_results(self, results: List[Dict], ground_truth: Dict[str, any] = None) -> List[Dict]:
+    def annotate_results(
+        self,
+        results: List[Dict],
+        ground_truth: Dict[str, any] = None,
+        workers: Optional[int] = None
+    ) -> List[Dict]:
         """
         Annotate results with outcome categories.
         
         Args:
             results: List of result dictionaries
             ground_truth: Dictionary mapping prompts to ground truth info
+            workers: Number of worker processes (default: annotate serially);
+                only worthwhile for large result sets, since each result is
+                pickled to and from a worker
         
         Returns:
             Annotated results
@@ -97,38 +238,17 @@ class ExperimentRunner:
         if ground_truth is None:
             ground_truth = {}
         
-        annotated = []
-        for result in results:
-            prompt = result["prompt"]
-            gt_info = ground_truth.get(prompt, {})
-            
-            annotated_result = result.copy()
-            annotated_result["annotations"] = {}
-            
-            # Annotate each method
-            for method in ["vanilla", "rag", "self_consistency", "truthscore"]:
-                answer = result[method]["answer"]
-                is_refusal = self.annotator.detect_refusal(answer)
-                is_hedged = self.annotator.detect_hedging(answer)
-                
-                category = self.annotator.annotate(
-                    prompt=prompt,
-                    answer=answer,
-                    ground_truth=gt_info.get("answer"),
-                    is_correct=gt_info.get("is_correct"),
-                    is_refusal=is_refusal,
-                    is_hedged=is_hedged
-                )
-                
-                annotated_result["annotations"][method] = {
-                    "category": category.value,
-                    "is_refusal": is_refusal,
-                    "is_hedged": is_hedged,
-                }
-            
-            annotated.append(annotated_result)
-        
-        return annotated
+        annotate = functools.partial(
+            annotate_result,
+            ground_truth=ground_truth,
+            annotator=self.annotator,
+            cache=self.annotation_cache
+        )
+        if workers is None or workers <= 1:
+            return [annotate(result) for result in results]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(annotate, results, chunksize=16))
     
     def summarize_results(self, annotated_results: List[Dict]) -> Dict:
         """
@@ -138,44 +258,34 @@ class ExperimentRunner:
             annotated_results: List of annotated result dictionaries
         
         Returns:
-            Summary statistics dictionary
+            Summary statistics dictionary; counts are keyed by method, use
+            ``annotation.summary_by_category`` for the per-category view
         """
-        methods = ["vanilla", "rag", "self_consistency", "truthscore"]
-        categories = [cat.value for cat in OutcomeCategory]
-        
         summary = {
             "total_prompts": len(annotated_results),
             "by_method": {},
-            "by_category": {cat: {} for cat in categories}
         }
         
-        # Count by method and category
-        for method in methods:
-            summary["by_method"][method] = {cat: 0 for cat in categories}
-            
-            for result in annotated_results:
-                category = result["annotations"][method]["category"]
-                summary["by_method"][method][category] += 1
-        
-        # Count by category across all methods
-        for category in categories:
-            for method in methods:
-                summary["by_category"][category][method] = summary["by_method"][method][category]
+        # Count by method and category, one pass over the results per method
+        for method in METHODS:
+            counts = Counter(
+                result["annotations"][method]["category"]
+                for result in annotated_results
+            )
+            summary["by_method"][method] = {cat: counts[cat] for cat in _CATEGORIES}
         
         return summary
     
     def save_results(self, results: List[Dict], filename: str = "experiment_results.json"):
         """Save results to JSON file."""
         filepath = self.output_dir / filename
-        with open(filepath, 'w') as f:
-            json.dump(results, f, indent=2)
+        jsonio.dump(results, filepath)
         print(f"Results saved to {filepath}")
     
     def save_summary(self, summary: Dict, filename: str = "experiment_summary.json"):
         """Save summary to JSON file."""
         filepath = self.output_dir / filename
-        with open(filepath, 'w') as f:
-            json.dump(summary, f, indent=2)
+        jsonio.dump(summary, filepath)
         print(f"Summary saved to {filepath}")
     
     def print_summary_table(self, summary: Dict):
@@ -184,20 +294,14 @@ class ExperimentRunner:
         print("EXPERIMENT RESULTS SUMMARY")
         print("="*80)
         
-        methods = ["vanilla", "rag", "self_consistency", "truthscore"]
-        categories = [cat.value for cat in OutcomeCategory]
-        
         # Print header
-        print(f"\n{'Method':<20} " + " ".join(f"{cat[:15]:<15}" for cat in categories))
+        print("\n" + " ".join([f"{'Method':<20}"] + [f"{cat[:15]:<15}" for cat in _CATEGORIES]))
         print("-" * 80)
         
         # Print rows
-        for method in methods:
-            row = f"{method:<20} "
-            for category in categories:
-                count = summary["by_method"][method][category]
-                row += f"{count:<15} "
-            print(row)
+        for method in METHODS:
+            counts = summary["by_method"][method]
+            print(" ".join([f"{method:<20}"] + [f"{counts[category]:<15}" for category in _CATEGORIES]))
         
         print("\n" + "="*80)
 
@@ -207,11 +311,15 @@ def main():
     print("Starting TruthScore Experiment")
     print("="*80)
     
-    runner = ExperimentRunner()
+    # Re-runs replay cached LLM responses instead of calling the API again
+    runner = ExperimentRunner(response_cache=DiskCache())
     
     # Run experiment on all prompts
+    # Results are streamed to a JSON-lines checkpoint; an interrupted run
+    # picks up where it left off
+    checkpoint = "experiment_results.jsonl"
     print(f"\nRunning experiment on {len(ALL_PROMPTS)} prompts...")
-    results = runner.run_all_prompts()
+    results = runner.run_all_prompts(checkpoint=checkpoint)
     
     # Annotate results (using placeholder ground truth)
     print("\nAnnotating results...")
@@ -228,6 +336,11 @@ def main():
     runner.save_results(annotated_results)
     runner.save_summary(summary)
     
+    # The run is complete: the next one starts afresh (from the response cache)
+    (runner.output_dir / checkpoint).unlink()
+    
+    stats = runner.response_cache.stats
+    print(f"\nLLM response cache: {stats['hits']} hits, {stats['misses']} misses")
     print("\nExperiment complete!")
 
 
@@ -6,27 +6,47 @@ without requiring API calls. Perfect for paper experiments where you already
 have LLM outputs.
 """
 
-import json
+import functools
+from dataclasses import asdict
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Optional
 from pathlib import Path
 
 from experiments.prompts import ALL_PROMPTS, PROMPT_CATEGORIES
-from experiments.annotation import OutcomeCategory, Annotator
+from experiments.annotation import METHODS, OutcomeCategory, Annotator, annotate_result
+from experiments import jsonio
+from experiments.llm_cache import DiskCache, cache_key
 from truthscore import TruthScorer
 
 
+# Outcome categories, in report order
+_CATEGORIES = tuple(cat.value for cat in OutcomeCategory)
+
+
 class ManualExperimentRunner:
     """Experiment runner for manual Q&A pairs."""
     
-    def __init__(self, output_dir: str = "experiments/results"):
+    def __init__(
+        self,
+        output_dir: str = "experiments/results",
+        annotation_cache: Optional[DiskCache] = None,
+        score_cache: Optional[DiskCache] = None
+    ):
         """
         Initialize manual experiment runner.
         
         Args:
             output_dir: Directory to save results
+            annotation_cache: Optional persistent cache of per-answer annotations
+            score_cache: Optional persistent cache of Truth Scores, keyed on
+                (prompt, answer, scorer config); clear it when the evidence
+                corpus changes
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.annotation_cache = annotation_cache
+        self.score_cache = score_cache
         
         self.scorer = TruthScorer()
         self.annotator = Annotator()
@@ -59,24 +79,51 @@ class ManualExperimentRunner:
         results = []
         
         for prompt in prompts:
+            prompt_answers = answers.get(prompt, {})
             result = {
                 "prompt": prompt,
-                "vanilla": {"answer": answers.get(prompt, {}).get("vanilla", "")},
-                "rag": {"answer": answers.get(prompt, {}).get("rag", "")},
-                "self_consistency": {"answer": answers.get(prompt, {}).get("self_consistency", "")},
-                "truthscore": {"answer": answers.get(prompt, {}).get("truthscore", "")},
+                "vanilla": {"answer": prompt_answers.get("vanilla", "")},
+                "rag": {"answer": prompt_answers.get("rag", "")},
+                "self_consistency": {"answer": prompt_answers.get("self_consistency", "")},
+                "truthscore": {"answer": prompt_answers.get("truthscore", "")},
             }
             
-            # Evaluate TruthScore for truthscore method
-            truthscore_answer = result["truthscore"]["answer"]
-            if truthscore_answer:
-                score_result = self.scorer.score(question=prompt, answer=truthscore_answer)
-                result["truthscore"]["truth_score"] = score_result["truth_score"]
-                result["truthscore"]["decision"] = score_result["decision"]
-                result["truthscore"]["score_details"] = score_result
-            
             results.append(result)
         
+        # Evaluate TruthScore for truthscore method, in one batch so retrieval
+        # is shared across prompts; answers scored in a previous run are
+        # served from the score cache
+        to_score = [result for result in results if result["truthscore"]["answer"]]
+        score_results: List[Optional[Dict]] = [None] * len(to_score)
+        keys: List[str] = []
+        if self.score_cache is not None:
+            config = asdict(self.scorer.config)
+            keys = [
+                cache_key(
+                    kind="truth_score",
+                    prompt=result["prompt"],
+                    answer=result["truthscore"]["answer"],
+                    config=config
+                )
+                for result in to_score
+            ]
+            score_results = [self.score_cache.get(key) for key in keys]
+        
+        misses = [i for i, score_result in enumerate(score_results) if score_result is None]
+        fresh = self.scorer.score_batch(
+            [to_score[i]["prompt"] for i in misses],
+            [to_score[i]["truthscore"]["answer"] for i in misses]
+        )
+        for i, score_result in zip(misses, fresh):
+            score_results[i] = score_result
+            if self.score_cache is not None:
+                self.score_cache.set(keys[i], score_result)
+        
+        for result, score_result in zip(to_score, score_results):
+            result["truthscore"]["truth_score"] = score_result["truth_score"]
+            result["truthscore"]["decision"] = score_result["decision"]
+            result["truthscore"]["score_details"] = score_result
+        
         return results
     
     def run_from_file(self, input_file: str) -> List[Dict]:
@@ -95,8 +142,7 @@ class ManualExperimentRunner:
             ...
         ]
         """
-        with open(input_file, 'r') as f:
-            data = json.load(f)
+        data = jsonio.load(input_file)
         
         prompts = [item["prompt"] for item in data]
         answers = {
@@ -111,13 +157,21 @@ class ManualExperimentRunner:
         
         return self.run_with_answers(prompts, answers)
     
-    def annotate_results(self, results: List[Dict], ground_truth: Dict[str, any] = None) -> List[Dict]:
+    def annotate_results(
+        self,
+        results: List[Dict],
+        ground_truth: Dict[str, any] = None,
+        workers: Optional[int] = None
+    ) -> List[Dict]:
         """
         Annotate results with outcome categories.
         
         Args:
             results: List of result dictionaries
             ground_truth: Dictionary mapping prompts to ground truth info
+            workers: Number of worker processes (default: annotate serially);
+                only worthwhile for large result sets, since each result is
+                pickled to and from a worker
         
         Returns:
             Annotated results
@@ -125,41 +179,18 @@ class ManualExperimentRunner:
         if ground_truth is None:
             ground_truth = {}
         
-        annotated = []
-        for result in results:
-            prompt = result["prompt"]
-            gt_info = ground_truth.get(prompt, {})
-            
-            annotated_result = result.copy()
-            annotated_result["annotations"] = {}
-            
-            # Annotate each method
-            for method in ["vanilla", "rag", "self_consistency", "truthscore"]:
-                answer = result[method]["answer"]
-                if not answer:
-                    continue
-                    
-                is_refusal = self.annotator.detect_refusal(answer)
-                is_hedged = self.annotator.detect_hedging(answer)
-                
-                category = self.annotator.annotate(
-                    prompt=prompt,
-                    answer=answer,
-                    ground_truth=gt_info.get("answer"),
-                    is_correct=gt_info.get("is_correct"),
-                    is_refusal=is_refusal,
-                    is_hedged=is_hedged
-                )
-                
-                annotated_result["annotations"][method] = {
-                    "category": category.value,
-                    "is_refusal": is_refusal,
-                    "is_hedged": is_hedged,
-                }
-            
-            annotated.append(annotated_result)
+        annotate = functools.partial(
+            annotate_result,
+            ground_truth=ground_truth,
+            annotator=self.annotator,
+            cache=self.annotation_cache,
+            skip_empty=True
+        )
+        if workers is None or workers <= 1:
+            return [annotate(result) for result in results]
         
-        return annotated
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(annotate, results, chunksize=16))
     
     def summarize_results(self, annotated_results: List[Dict]) -> Dict:
         """
@@ -169,45 +200,35 @@ class ManualExperimentRunner:
             annotated_results: List of annotated result dictionaries
         
         Returns:
-            Summary statistics dictionary
+            Summary statistics dictionary; counts are keyed by method, use
+            ``annotation.summary_by_category`` for the per-category view
         """
-        methods = ["vanilla", "rag", "self_consistency", "truthscore"]
-        categories = [cat.value for cat in OutcomeCategory]
-        
         summary = {
             "total_prompts": len(annotated_results),
             "by_method": {},
-            "by_category": {cat: {} for cat in categories}
         }
         
-        # Count by method and category
-        for method in methods:
-            summary["by_method"][method] = {cat: 0 for cat in categories}
-            
-            for result in annotated_results:
-                if method in result["annotations"]:
-                    category = result["annotations"][method]["category"]
-                    summary["by_method"][method][category] += 1
-        
-        # Count by category across all methods
-        for category in categories:
-            for method in methods:
-                summary["by_category"][category][method] = summary["by_method"][method][category]
+        # Count by method and category, one pass over the results per method
+        for method in METHODS:
+            counts = Counter(
+                result["annotations"][method]["category"]
+                for result in annotated_results
+                if method in result["annotations"]
+            )
+            summary["by_method"][method] = {cat: counts[cat] for cat in _CATEGORIES}
         
         return summary
     
     def save_results(self, results: List[Dict], filename: str = "manual_experiment_results.json"):
         """Save results to JSON file."""
         filepath = self.output_dir / filename
-        with open(filepath, 'w') as f:
-            json.dump(results, f, indent=2)
+        jsonio.dump(results, filepath)
         print(f"Results saved to {filepath}")
     
     def save_summary(self, summary: Dict, filename: str = "manual_experiment_summary.json"):
         """Save summary to JSON file."""
         filepath = self.output_dir / filename
-        with open(filepath, 'w') as f:
-            json.dump(summary, f, indent=2)
+        jsonio.dump(summary, filepath)
         print(f"Summary saved to {filepath}")
     
     def print_summary_table(self, summary: Dict):
@@ -216,43 +237,35 @@ class ManualExperimentRunner:
         print("EXPERIMENT RESULTS SUMMARY")
         print("="*80)
         
-        methods = ["vanilla", "rag", "self_consistency", "truthscore"]
-        categories = [cat.value for cat in OutcomeCategory]
-        
         # Print header
-        print(f"\n{'Method':<20} " + " ".join(f"{cat[:15]:<15}" for cat in categories))
+        print("\n" + " ".join([f"{'Method':<20}"] + [f"{cat[:15]:<15}" for cat in _CATEGORIES]))
         print("-" * 80)
         
         # Print rows
-        for method in methods:
-            row = f"{method:<20} "
-            for category in categories:
-                count = summary["by_method"][method][category]
-                row += f"{count:<15} "
-            print(row)
+        for method in METHODS:
+            counts = summary["by_method"][method]
+            print(" ".join([f"{method:<20}"] + [f"{counts[category]:<15}" for category in _CATEGORIES]))
         
         print("\n" + "="*80)
 
 
 def create_template_file(filename: str = "experiments/manual_answers_template.json"):
     """Create a template file for manual answers."""
-    template = [
-        {
-            "prompt": "Does vitamin C prevent the common cold?",
-            "vanilla": "Your vanilla LLM answer here",
-            "rag": "Your RAG answer here",
-            "self_consistency": "Your self-consistency answer here",
-            "truthscore": "Your truthscore answer here",
-            "ground_truth": {
-                "answer": "Correct answer if known",
-                "is_correct": True  # or False
-            }
+    example = {
+        "prompt": "Does vitamin C prevent the common cold?",
+        "vanilla": "Your vanilla LLM answer here",
+        "rag": "Your RAG answer here",
+        "self_consistency": "Your self-consistency answer here",
+        "truthscore": "Your truthscore answer here",
+        "ground_truth": {
+            "answer": "Correct answer if known",
+            "is_correct": True  # or False
         }
-    ]
+    }
     
-    # Add all prompts
-    for prompt in ALL_PROMPTS:
-        template.append({
+    # One example entry, then an empty entry for every prompt
+    template = [example] + [
+        {
             "prompt": prompt,
             "vanilla": "",
             "rag": "",
@@ -262,13 +275,14 @@ def create_template_file(filename: str = "experiments/manual_answers_template.js
                 "answer": "",
                 "is_correct": None
             }
-        })
+        }
+        for prompt in ALL_PROMPTS
+    ]
     
     filepath = Path(filename)
     filepath.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(filepath, 'w') as f:
-        json.dump(template, f, indent=2)
+    jsonio.dump(template, filepath)
     
     print(f"Template created at {filepath}")
     print(f"Fill in the answers and run: python -m experiments.run_manual_experiment")
@@ -287,7 +301,12 @@ def main():
     input_file = sys.argv[1]
     
     print(f"Loading answers from {input_file}...")
-    runner = ManualExperimentRunner()
+    # Re-runs only score answers that are new or were edited
+    output_dir = Path("experiments/results")
+    runner = ManualExperimentRunner(
+        output_dir=str(output_dir),
+        score_cache=DiskCache(output_dir / ".score_cache.sqlite")
+    )
     
     results = runner.run_from_file(input_file)
     
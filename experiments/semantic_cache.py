@@ -0,0 +1,163 @@
+"""
+Semantic response cache for experiment inference configurations.
+
+Prompts are embedded and compared by cosine similarity against previously
+seen prompts; a near-duplicate (similarity above ``threshold``) reuses the
+stored result instead of calling the model again.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+def openai_embedder(client, model: str = "text-embedding-3-small") -> Callable[[str], List[float]]:
+    """
+    Build an embedding function backed by the OpenAI embeddings endpoint.
+
+    Args:
+        client: ``openai.OpenAI`` client instance
+        model: Embedding model name (default: text-embedding-3-small)
+
+    Returns:
+        Function mapping a text to its embedding vector
+    """
+    def embed(text: str) -> List[float]:
+        response = client.embeddings.create(input=[text], model=model)
+        return response.data[0].embedding
+
+    return embed
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache keyed by prompt embeddings.
+
+    Embeddings are L2-normalized and stored row-wise in a preallocated
+    ``(capacity, d)`` float32 matrix, so a lookup is a single matrix-vector
+    product followed by ``argmax``.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], Sequence[float]],
+        threshold: float = 0.92,
+        path: Optional[str] = None,
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            embed: Function mapping a prompt to an embedding vector
+            threshold: Minimum cosine similarity for a cache hit (default: 0.92)
+            path: Optional file stem for persistence (``<path>.npy`` + ``<path>.json``)
+        """
+        if np is None:
+            raise ImportError(
+                "SemanticCache requires numpy: pip install 'truthscore-llm[experiments]'"
+            )
+        self._embed = embed
+        self.threshold = threshold
+        self._path = Path(path) if path else None
+        self._lock = threading.Lock()
+
+        self._matrix = None
+        self._size = 0
+        self._prompts: List[str] = []
+        self._values: List[Any] = []
+
+        if self._path is not None and self._path.with_suffix(".npy").exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _vector(self, prompt: str):
+        v = np.asarray(self._embed(prompt), dtype=np.float32)
+        norm = float(np.linalg.norm(v))
+        return v / norm if norm > 0 else v
+
+    def _nearest(self, v) -> Optional[int]:
+        if self._size == 0:
+            return None
+        sims = self._matrix[: self._size] @ v
+        i = int(np.argmax(sims))
+        return i if sims[i] > self.threshold else None
+
+    def _append(self, v, prompt: str, value: Any) -> None:
+        if self._matrix is None:
+            self._matrix = np.empty((16, v.shape[0]), dtype=np.float32)
+        elif self._size == self._matrix.shape[0]:
+            grown = np.empty((2 * self._size, self._matrix.shape[1]), dtype=np.float32)
+            grown[: self._size] = self._matrix
+            self._matrix = grown
+        self._matrix[self._size] = v
+        self._size += 1
+        self._prompts.append(prompt)
+        self._values.append(value)
+
+    def get(self, prompt: str) -> Optional[Any]:
+        """Return the cached value for the nearest stored prompt, or None."""
+        v = self._vector(prompt)
+        with self._lock:
+            i = self._nearest(v)
+            return self._values[i] if i is not None else None
+
+    def get_or_compute(
+        self,
+        prompt: str,
+        compute: Callable[[], Any],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return a cached value for ``prompt`` or compute and store a new one.
+
+        Args:
+            prompt: Prompt used as the semantic key
+            compute: Zero-argument function producing the value on a miss
+            cacheable: Optional predicate; values failing it are not stored
+
+        Returns:
+            Cached or freshly computed value
+        """
+        v = self._vector(prompt)
+        with self._lock:
+            i = self._nearest(v)
+            if i is not None:
+                return self._values[i]
+
+        value = compute()
+        if cacheable is None or cacheable(value):
+            with self._lock:
+                self._append(v, prompt, value)
+        return value
+
+    def save(self) -> None:
+        """Persist embeddings (``.npy``) and prompts/values (``.json`` sidecar)."""
+        if self._path is None:
+            raise ValueError("SemanticCache was created without a path")
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            matrix = self._matrix[: self._size] if self._matrix is not None else np.empty((0, 0))
+            np.save(self._path.with_suffix(".npy"), matrix)
+            with open(self._path.with_suffix(".json"), 'w') as f:
+                json.dump({"prompts": self._prompts, "values": self._values}, f)
+
+    def load(self) -> None:
+        """Load a cache previously written by ``save``."""
+        if self._path is None:
+            raise ValueError("SemanticCache was created without a path")
+        matrix = np.load(self._path.with_suffix(".npy")).astype(np.float32)
+        with open(self._path.with_suffix(".json"), 'r') as f:
+            data = json.load(f)
+        with self._lock:
+            self._matrix = matrix if matrix.size else None
+            self._size = len(data["prompts"]) if matrix.size else 0
+            self._prompts = list(data["prompts"][: self._size])
+            self._values = list(data["values"][: self._size])
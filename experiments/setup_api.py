@@ -4,8 +4,43 @@ Setup script for OpenAI API configuration.
 Run this to check your OpenAI API setup before running experiments.
 """
 
+import functools
 import os
 import sys
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+# Connection pool shared by every request made through one client; sized for
+# the concurrent prompt/config fan-out of the experiment runner
+_POOL_LIMITS = {"max_connections": 64, "max_keepalive_connections": 32}
+
+# Extra retries: the SDK backs off exponentially (with jitter) on 429s, which
+# concurrent experiment runs hit more often
+_MAX_RETRIES = 5
+
+
+@functools.lru_cache(maxsize=None)
+def get_client(api_key: Optional[str] = None) -> "OpenAI":
+    """
+    Return the shared OpenAI client for ``api_key``, creating it on first use.
+    
+    Reusing one long-lived client per key keeps HTTP keep-alive connections
+    (and TLS sessions) open across calls and inference configurations.
+    
+    Args:
+        api_key: OpenAI API key (default: from OPENAI_API_KEY env var)
+    """
+    import httpx
+    from openai import OpenAI
+    
+    return OpenAI(
+        api_key=api_key or os.environ["OPENAI_API_KEY"],
+        max_retries=_MAX_RETRIES,
+        http_client=httpx.Client(limits=httpx.Limits(**_POOL_LIMITS)),
+    )
+
 
 def check_openai_setup():
     """Check if OpenAI is properly configured."""
@@ -36,8 +71,7 @@ def check_openai_setup():
     # Test API call
     print("\nTesting API connection...")
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
+        client = get_client(api_key)
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": "Say 'test'"}],
@@ -2,74 +2,63 @@
 """Fix metadata in distribution files to remove problematic license-file fields."""
 import zipfile
 import tarfile
-import tempfile
+import io
 import os
 import shutil
 from pathlib import Path
 
+LICENSE_FIELD_PREFIXES = (b'License-File:', b'Dynamic: license-file')
+
+def strip_license_fields(metadata):
+    """Return METADATA/PKG-INFO bytes without license-file fields."""
+    lines = metadata.splitlines(keepends=True)
+    return b''.join(line for line in lines if not line.startswith(LICENSE_FIELD_PREFIXES))
+
 def fix_wheel(wheel_path):
     """Remove license-file fields from wheel METADATA."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Extract wheel
-        with zipfile.ZipFile(wheel_path, 'r') as zip_ref:
-            zip_ref.extractall(tmpdir)
-        
-        # Fix METADATA
-        metadata_path = Path(tmpdir) / f"{Path(wheel_path).stem.replace('-py3-none-any', '')}.dist-info" / "METADATA"
-        if metadata_path.exists():
-            lines = []
-            with open(metadata_path, 'r') as f:
-                for line in f:
-                    if not line.startswith('License-File:') and not line.startswith('Dynamic: license-file'):
-                        lines.append(line)
-            
-            with open(metadata_path, 'w') as f:
-                f.writelines(lines)
-        
-        # Recreate wheel
-        os.remove(wheel_path)
-        with zipfile.ZipFile(wheel_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
-            for root, dirs, files in os.walk(tmpdir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arc_name = os.path.relpath(file_path, tmpdir)
-                    zip_ref.write(file_path, arc_name)
-    
+    # Copy members one at a time into a sibling file, rewriting only METADATA
+    tmp_path = f"{wheel_path}.tmp"
+    try:
+        with zipfile.ZipFile(wheel_path, 'r') as src, \
+                zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                top, _, name = info.filename.partition('/')
+                if top.endswith('.dist-info') and name == 'METADATA':
+                    dst.writestr(info, strip_license_fields(src.read(info)))
+                else:
+                    with src.open(info) as member, dst.open(info, 'w') as out:
+                        shutil.copyfileobj(member, out)
+        os.replace(tmp_path, wheel_path)
+    finally:
+        # Only left behind if the rewrite failed
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
     print(f"Fixed {wheel_path}")
 
 def fix_sdist(sdist_path):
     """Remove license-file fields from sdist PKG-INFO."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Extract sdist
-        with tarfile.open(sdist_path, 'r:gz') as tar_ref:
-            tar_ref.extractall(tmpdir)
-        
-        # Find and fix PKG-INFO
-        pkg_info_path = None
-        for root, dirs, files in os.walk(tmpdir):
-            if 'PKG-INFO' in files:
-                pkg_info_path = os.path.join(root, 'PKG-INFO')
-                break
-        
-        if pkg_info_path:
-            lines = []
-            with open(pkg_info_path, 'r') as f:
-                for line in f:
-                    if not line.startswith('License-File:') and not line.startswith('Dynamic: license-file'):
-                        lines.append(line)
-            
-            with open(pkg_info_path, 'w') as f:
-                f.writelines(lines)
-        
-        # Recreate sdist
-        os.remove(sdist_path)
-        with tarfile.open(sdist_path, 'w:gz') as tar_ref:
-            for root, dirs, files in os.walk(tmpdir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arc_name = os.path.relpath(file_path, tmpdir)
-                    tar_ref.add(file_path, arc_name)
-    
+    # Stream members into a sibling archive, swapping in a rewritten PKG-INFO
+    tmp_path = f"{sdist_path}.tmp"
+    try:
+        with tarfile.open(sdist_path, 'r|gz') as src, \
+                tarfile.open(tmp_path, 'w|gz') as dst:
+            for member in src:
+                if not member.isfile():
+                    dst.addfile(member)
+                    continue
+                data = src.extractfile(member)
+                if member.name.count('/') == 1 and member.name.endswith('/PKG-INFO'):
+                    fixed = strip_license_fields(data.read())
+                    member.size = len(fixed)
+                    data = io.BytesIO(fixed)
+                dst.addfile(member, data)
+        os.replace(tmp_path, sdist_path)
+    finally:
+        # Only left behind if the rewrite failed
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
     print(f"Fixed {sdist_path}")
 
 if __name__ == '__main__':
@@ -79,4 +68,3 @@ if __name__ == '__main__':
             fix_wheel(dist_file)
         elif dist_file.suffix == '.gz' and 'tar' in dist_file.name:
             fix_sdist(dist_file)
-
@@ -0,0 +1,94 @@
+"""
+Marker detection in experiment annotation.
+
+The compiled trie / lookahead patterns must agree with the plain substring scan
+they replace: ``any(marker in answer.lower() for marker in markers)``.
+"""
+
+import random
+import unittest
+
+from experiments import annotation
+from experiments.annotation import (
+    Annotator,
+    OutcomeCategory,
+    classify,
+    detect_hedging,
+    detect_leading_refusal,
+    detect_refusal,
+)
+
+
+def _substring_scan(answer, markers):
+    lowered = answer.lower()
+    return any(marker in lowered for marker in markers)
+
+
+def _random_answers(count, seed=0):
+    """Answers stitched from marker fragments, overlaps and filler text."""
+    rng = random.Random(seed)
+    markers = sorted(annotation._HEDGING_MARKERS | annotation._REFUSAL_MARKERS)
+    fragments = markers + [m[: len(m) // 2] for m in markers] + [m[len(m) // 2:] for m in markers]
+    fragments += ["", " ", "the", "Paris", ".", "not ", "I ", "can", "CANNOT", "Maybe", "unkn"]
+    for _ in range(count):
+        yield "".join(rng.choice(fragments) for _ in range(rng.randint(0, 8)))
+
+
+class TestMarkerDetection(unittest.TestCase):
+    def test_detectors_match_substring_scan(self):
+        for answer in _random_answers(5000):
+            with self.subTest(answer=answer):
+                self.assertEqual(
+                    detect_hedging(answer),
+                    _substring_scan(answer, annotation._HEDGING_MARKERS),
+                )
+                self.assertEqual(
+                    detect_refusal(answer),
+                    _substring_scan(answer, annotation._REFUSAL_MARKERS),
+                )
+
+    def test_classify_matches_individual_detectors(self):
+        for answer in _random_answers(5000, seed=1):
+            with self.subTest(answer=answer):
+                self.assertEqual(
+                    classify(answer), (detect_hedging(answer), detect_refusal(answer))
+                )
+                self.assertEqual(Annotator.classify(answer), classify(answer))
+
+    def test_overlapping_markers_are_both_reported(self):
+        # A hedge marker must not hide a refusal marker in the same answer
+        self.assertEqual(classify("I am not sure and unable to say"), (True, True))
+        self.assertEqual(classify("Cannot answer"), (False, True))
+        self.assertEqual(classify("It MIGHT rain"), (True, False))
+        self.assertEqual(classify(""), (False, False))
+
+    def test_leading_refusal_is_anchored(self):
+        self.assertTrue(detect_leading_refusal("I cannot answer that."))
+        self.assertTrue(detect_leading_refusal("Sorry, I don't know."))
+        self.assertTrue(detect_leading_refusal("I'm unable to verify this"))
+        self.assertFalse(detect_leading_refusal("Vitamin C cannot prevent colds."))
+        self.assertFalse(detect_leading_refusal("There is insufficient evidence"))
+        self.assertFalse(detect_leading_refusal("Insufficient vitamin D intake causes rickets."))
+        self.assertFalse(detect_leading_refusal("No information about it was released until 1990."))
+
+    def test_leading_refusal_is_undecided_on_a_viable_opening(self):
+        self.assertIsNone(detect_leading_refusal("Sorry,"))
+        self.assertIsNone(detect_leading_refusal("I’m not"))
+        self.assertFalse(detect_leading_refusal("I’m not sure"))
+        self.assertFalse(detect_leading_refusal("Sorry for the delay"))
+
+
+class TestAnnotate(unittest.TestCase):
+    def test_refusal_with_unknown_ground_truth_is_correct_refusal(self):
+        category = Annotator.annotate(
+            "q", "I cannot answer", ground_truth="Unknown", is_refusal=True
+        )
+        self.assertEqual(category, OutcomeCategory.CORRECT_REFUSAL)
+
+    def test_wrong_confident_answer_is_overconfident_error(self):
+        category = Annotator.annotate("q", "Lyon", ground_truth="Paris", is_correct=False)
+        self.assertEqual(category, OutcomeCategory.OVERCONFIDENT_ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
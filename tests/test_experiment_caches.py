@@ -0,0 +1,248 @@
+"""
+Persistence layers of the experiment runner: response cache, semantic cache,
+and the JSON-lines results checkpoint.
+"""
+
+import asyncio
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+
+from experiments import jsonio
+from experiments.llm_cache import DiskCache, cache_key, cached
+from experiments.semantic_cache import SemanticCache, np
+
+
+class _TempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+
+
+class TestDiskCache(_TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.tmpdir, "cache.sqlite")
+        self.cache = DiskCache(self.path)
+        self.addCleanup(self.cache.close)
+
+    def test_hit_miss_and_stats(self):
+        self.assertIsNone(self.cache.get("k"))
+        self.cache.set("k", {"answer": "Paris"})
+        self.assertEqual(self.cache.get("k"), {"answer": "Paris"})
+        self.assertIn("k", self.cache)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.stats, {"hits": 1, "misses": 1})
+
+    def test_persists_across_instances(self):
+        self.cache.set("k", [1, 2])
+        reopened = DiskCache(self.path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.get("k"), [1, 2])
+
+    def test_pickles_by_path(self):
+        self.cache.set("k", "v")
+        clone = pickle.loads(pickle.dumps(self.cache))
+        self.addCleanup(clone.close)
+        self.assertEqual(clone.path, self.cache.path)
+        self.assertEqual(clone.get("k"), "v")
+
+    def test_cache_key_is_order_independent(self):
+        self.assertEqual(cache_key(a=1, b="x"), cache_key(b="x", a=1))
+        self.assertNotEqual(cache_key(a=1), cache_key(a=2))
+
+
+class _Config:
+    """Minimal inference config exposing what ``cached`` relies on."""
+
+    def __init__(self, cache, temperature=0.0):
+        self.response_cache = cache
+        self.temperature = temperature
+        self.calls = 0
+
+    def _cache_fields(self):
+        return {"model": "m", "temperature": self.temperature}
+
+    @cached(cacheable=lambda result: not result.get("error"))
+    def complete(self, prompt):
+        self.calls += 1
+        if prompt == "fail":
+            return {"error": "boom"}
+        return {"answer": f"{prompt}-{self.calls}"}
+
+    @cached(stochastic=True)
+    def sample(self, prompt, index):
+        self.calls += 1
+        return {"answer": f"{prompt}-{index}-{self.calls}"}
+
+
+class TestCachedDecorator(_TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = DiskCache(os.path.join(self.tmpdir, "cache.sqlite"))
+        self.addCleanup(self.cache.close)
+
+    def test_second_call_is_served_from_cache(self):
+        config = _Config(self.cache)
+        first = config.complete("q")
+        self.assertEqual(_Config(self.cache).complete("q"), first)
+        self.assertEqual(config.calls, 1)
+
+    def test_non_cacheable_results_are_not_stored(self):
+        config = _Config(self.cache)
+        config.complete("fail")
+        config.complete("fail")
+        self.assertEqual(config.calls, 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_sampled_decoding_bypasses_cache(self):
+        config = _Config(self.cache, temperature=0.7)
+        self.assertNotEqual(config.complete("q"), config.complete("q"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_stochastic_methods_cache_each_index(self):
+        config = _Config(self.cache, temperature=0.8)
+        samples = [config.sample("q", i) for i in range(3)]
+        self.assertEqual([config.sample("q", i) for i in range(3)], samples)
+        self.assertEqual(len(set(s["answer"] for s in samples)), 3)
+        self.assertEqual(config.calls, 3)
+
+    def test_without_cache_runs_uncached(self):
+        config = _Config(None)
+        config.complete("q")
+        config.complete("q")
+        self.assertEqual(config.calls, 2)
+
+
+def _one_hot_embedder(dim=64):
+    """Embed each distinct prompt as its own basis vector."""
+    index = {}
+
+    def embed(text):
+        i = index.setdefault(text, len(index))
+        v = [0.0] * dim
+        v[i % dim] = 1.0
+        return v
+
+    return embed
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestSemanticCache(_TempDirTestCase):
+    def test_threshold_and_growth_past_initial_capacity(self):
+        cache = SemanticCache(_one_hot_embedder(), threshold=0.9)
+        calls = []
+        for i in range(40):
+            cache.get_or_compute(f"p{i}", lambda i=i: calls.append(i) or f"v{i}")
+        self.assertEqual(len(cache), 40)
+        self.assertEqual(cache.get("p0"), "v0")
+        self.assertEqual(cache.get("p39"), "v39")
+        # Orthogonal to every stored prompt: below the threshold
+        self.assertIsNone(cache.get("unseen"))
+        self.assertEqual(cache.get_or_compute("p7", lambda: "recomputed"), "v7")
+        self.assertEqual(len(calls), 40)
+
+    def test_non_cacheable_values_are_not_stored(self):
+        cache = SemanticCache(_one_hot_embedder())
+        cache.get_or_compute("p", lambda: None, cacheable=lambda v: v is not None)
+        self.assertEqual(len(cache), 0)
+
+    def test_save_load_round_trip(self):
+        stem = os.path.join(self.tmpdir, "semantic")
+        embed = _one_hot_embedder()
+        cache = SemanticCache(embed, path=stem)
+        for i in range(20):
+            cache.get_or_compute(f"p{i}", lambda i=i: {"answer": i})
+        cache.save()
+
+        restored = SemanticCache(embed, path=stem)
+        self.assertEqual(len(restored), 20)
+        self.assertEqual(restored.get("p19"), {"answer": 19})
+
+
+class TestResultsCheckpoint(_TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        from experiments.run_experiment import ExperimentRunner
+
+        self.runner = ExperimentRunner(output_dir=self.tmpdir)
+        self.ran = []
+
+        async def fake_run(prompt, executor=None):
+            self.ran.append(prompt)
+            return {"prompt": prompt, "vanilla": {"answer": prompt.upper()}}
+
+        self.runner.arun_single_prompt = fake_run
+
+    def run_prompts(self, prompts):
+        with redirect_stdout(io.StringIO()):
+            return asyncio.run(
+                self.runner.arun_all_prompts(prompts, checkpoint="results.jsonl")
+            )
+
+    def test_resume_skips_done_prompts_and_truncated_line(self):
+        self.run_prompts(["a", "b"])
+        with open(os.path.join(self.tmpdir, "results.jsonl"), "a") as f:
+            f.write('{"prompt": "c", "vani')  # interrupted mid-write
+
+        results = self.run_prompts(["a", "b", "c"])
+
+        self.assertEqual(self.ran, ["a", "b", "c"])
+        self.assertEqual([r["prompt"] for r in results], ["a", "b", "c"])
+        self.assertEqual(
+            [r["prompt"] for r in self.runner.load_results("results.jsonl")],
+            ["a", "b", "c"],
+        )
+
+    def test_missing_checkpoint_loads_empty(self):
+        self.assertEqual(self.runner.load_results("absent.jsonl"), [])
+
+    def test_non_string_keys_are_written_as_strings(self):
+        # e.g. a self-consistency agreement count over a None answer
+        result = {"prompt": "q", "agreement": {None: 2, "Paris": 3}}
+        self.assertEqual(
+            jsonio.loads(jsonio.dumps(result)),
+            {"prompt": "q", "agreement": {"null": 2, "Paris": 3}},
+        )
+
+
+class TestConcurrency(_TempDirTestCase):
+    def test_calls_in_flight_reach_requested_concurrency(self):
+        from experiments.annotation import METHODS
+        from experiments.run_experiment import ExperimentRunner
+
+        runner = ExperimentRunner(output_dir=self.tmpdir)
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def slow_generate(prompt):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.2)
+            with lock:
+                in_flight -= 1
+            return {"answer": prompt}
+
+        for method in METHODS:
+            getattr(runner, method).generate = slow_generate
+
+        prompts = [f"p{i}" for i in range(16)]
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            asyncio.run(runner.arun_all_prompts(prompts, concurrency=16))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(peak, len(prompts) * len(METHODS))
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Release tooling: stripping license-file fields from built distributions.
+"""
+
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import fix_metadata
+
+METADATA = (
+    b"Metadata-Version: 2.4\n"
+    b"Name: demo\n"
+    b"License-File: LICENSE\n"
+    b"Dynamic: license-file\n"
+    b"Summary: d\xc3\xa9mo\n"
+)
+STRIPPED = b"Metadata-Version: 2.4\nName: demo\nSummary: d\xc3\xa9mo\n"
+
+
+class TestFixMetadata(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+
+    def fix(self, func, path):
+        with redirect_stdout(io.StringIO()):
+            func(path)
+
+    def test_fix_wheel(self):
+        path = os.path.join(self.tmpdir, "demo-1.0-py3-none-any.whl")
+        members = {
+            "demo/__init__.py": b"VALUE = 1\n" * 100,
+            "demo-1.0.dist-info/METADATA": METADATA,
+            "demo-1.0.dist-info/RECORD": b"record\n",
+        }
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in members.items():
+                zf.writestr(name, data)
+
+        self.fix(fix_metadata.fix_wheel, path)
+
+        with zipfile.ZipFile(path) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(zf.namelist(), list(members))
+            self.assertEqual(zf.read("demo-1.0.dist-info/METADATA"), STRIPPED)
+            for name in ("demo/__init__.py", "demo-1.0.dist-info/RECORD"):
+                self.assertEqual(zf.read(name), members[name])
+        self.assertEqual(os.listdir(self.tmpdir), [os.path.basename(path)])
+
+    def test_fix_sdist(self):
+        path = os.path.join(self.tmpdir, "demo-1.0.tar.gz")
+        members = {
+            "demo-1.0/PKG-INFO": METADATA,
+            "demo-1.0/demo/__init__.py": b"VALUE = 1\n",
+            "demo-1.0/demo.egg-info/PKG-INFO": METADATA,
+        }
+        with tarfile.open(path, "w:gz") as tf:
+            for name, data in members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+
+        self.fix(fix_metadata.fix_sdist, path)
+
+        with tarfile.open(path) as tf:
+            self.assertEqual(tf.getnames(), list(members))
+            self.assertEqual(tf.extractfile("demo-1.0/PKG-INFO").read(), STRIPPED)
+            for name in ("demo-1.0/demo/__init__.py", "demo-1.0/demo.egg-info/PKG-INFO"):
+                self.assertEqual(tf.extractfile(name).read(), members[name])
+        self.assertEqual(os.listdir(self.tmpdir), [os.path.basename(path)])
+
+    def test_failed_rewrite_leaves_no_temporary_file(self):
+        path = os.path.join(self.tmpdir, "demo-1.0-py3-none-any.whl")
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("demo-1.0.dist-info/METADATA", METADATA)
+
+        with patch.object(fix_metadata, "strip_license_fields", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.fix(fix_metadata.fix_wheel, path)
+        self.assertEqual(os.listdir(self.tmpdir), [os.path.basename(path)])
+        with zipfile.ZipFile(path) as zf:
+            self.assertEqual(zf.read("demo-1.0.dist-info/METADATA"), METADATA)
+
+
+if __name__ == "__main__":
+    unittest.main()
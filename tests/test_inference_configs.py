@@ -0,0 +1,117 @@
+"""
+Streamed generation in the experiment inference configurations.
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from experiments.annotation import detect_leading_refusal
+from experiments.inference_configs import VanillaLLM
+
+
+def _chunk(content=None, usage=None):
+    choices = [] if content is None else [SimpleNamespace(delta=SimpleNamespace(content=content))]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class _FakeStream:
+    """Chat completion stream yielding ``deltas``, then a usage-only chunk."""
+
+    def __init__(self, deltas):
+        usage = SimpleNamespace(
+            prompt_tokens=10, completion_tokens=len(deltas), total_tokens=10 + len(deltas)
+        )
+        self.chunks = [_chunk(delta) for delta in deltas] + [_chunk(usage=usage)]
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            if self.closed:
+                return
+            self.consumed += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeClient:
+    def __init__(self, deltas):
+        self.streams = []
+        self.deltas = deltas
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.streams.append(_FakeStream(self.deltas))
+        return self.streams[-1]
+
+
+class TestVanillaStreaming(unittest.TestCase):
+    def complete(self, deltas, stop_on=detect_leading_refusal):
+        llm = VanillaLLM(api_key="test")
+        llm.client = _FakeClient(deltas)
+        return llm._complete("q", stop_on), llm.client.streams[-1]
+
+    def test_apology_then_refusal_stops_early(self):
+        result, stream = self.complete(["Sorry", ",", " I", " cannot", " answer", " that", "."])
+        self.assertTrue(result["stopped_early"])
+        self.assertEqual(result["answer"], "Sorry, I cannot")
+        self.assertTrue(stream.closed)
+        self.assertLess(stream.consumed, len(stream.chunks))
+
+    def test_factual_answers_stream_in_full(self):
+        for deltas in (
+            ["Insufficient", " vitamin", " D", " intake", " causes", " rickets", "."],
+            ["No", " information", " about", " it", " was", " released", " until", " 1990", "."],
+            ["I", "'m", " not", " sure", ",", " but", " probably", " Paris", "."],
+        ):
+            with self.subTest(answer="".join(deltas)):
+                result, stream = self.complete(deltas)
+                self.assertFalse(result["stopped_early"])
+                self.assertEqual(result["answer"], "".join(deltas))
+                self.assertEqual(result["usage"]["completion_tokens"], len(deltas))
+                self.assertFalse(stream.closed)
+
+    def test_stop_on_is_not_called_once_decided(self):
+        calls = []
+
+        def stop_on(text):
+            calls.append(text)
+            return detect_leading_refusal(text)
+
+        self.complete(["Paris", " is", " the", " capital", "."], stop_on)
+        self.assertEqual(calls, ["Paris"])
+
+
+class TestVanillaMemo(unittest.TestCase):
+    def llm(self, deltas):
+        llm = VanillaLLM(api_key="test")
+        llm.client = _FakeClient(deltas)
+        llm._generate = llm._generate_real
+        return llm
+
+    def test_stop_on_callers_reuse_the_complete_response(self):
+        llm = self.llm(["Paris", "."])
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            vanilla = pool.submit(llm.generate, "q")
+            truthscore = pool.submit(llm.generate, "q", detect_leading_refusal)
+            results = [vanilla.result(), truthscore.result()]
+        self.assertEqual(len(llm.client.streams), 1)
+        self.assertEqual([r["answer"] for r in results], ["Paris.", "Paris."])
+
+    def test_memoized_refusal_still_stops(self):
+        llm = self.llm(["I", " cannot", " answer", "."])
+        self.assertFalse(llm.generate("q")["stopped_early"])
+        self.assertTrue(llm.generate("q", stop_on=detect_leading_refusal)["stopped_early"])
+        self.assertEqual(len(llm.client.streams), 1)
+
+    def test_callers_get_copies(self):
+        llm = self.llm(["Paris", "."])
+        llm.generate("q")["answer"] = "mutated"
+        self.assertEqual(llm.generate("q")["answer"], "Paris.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -76,6 +76,47 @@ class TestTruthScorer(unittest.TestCase):
         )
         self.assertNotEqual(r["decision"], "ACCEPT")
 
+    def test_score_batch_matches_score(self):
+        questions = [
+            "What is the capital of France?",
+            "What is the capital of France?",
+            "Does vitamin C prevent the common cold?",
+        ]
+        answers = [
+            "The capital of France is Paris.",
+            "The capital of France is London.",
+            "Vitamin C prevents the common cold.",
+        ]
+        batch = self.scorer.score_batch(questions, answers)
+        self.assertEqual(len(batch), len(answers))
+        for q, a, r in zip(questions, answers, batch):
+            with self.subTest(a=a[:20]):
+                self.assertEqual(r, self.scorer.score(question=q, answer=a))
+
+    def test_score_batch_retrieves_repeated_claims_once(self):
+        calls = []
+
+        class CountingRetriever:
+            def __init__(self, inner):
+                self._inner = inner
+
+            def similarity(self, a, b):
+                return self._inner.similarity(a, b)
+
+            def retrieve(self, query, top_k=5):
+                calls.append(query)
+                return self._inner.retrieve(query, top_k)
+
+        scorer = TruthScorer(retriever=CountingRetriever(self.scorer.retriever))
+        answer = "The capital of France is Paris."
+        scorer.score_batch(["Capital?", "Capital of France?"], [answer, answer])
+        self.assertEqual(len(calls), len(set(calls)))
+        self.assertGreater(len(calls), 0)
+
+    def test_score_batch_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.scorer.score_batch(["a", "b"], ["only one"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,7 +4,7 @@ Claim-grounded truth scoring: retrieve → verify per claim → aggregate.
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 from truthscore.claim_extractor import extract_claims_sentence
 from truthscore.claim_consistency import multi_sample_claim_consistency
@@ -89,6 +89,47 @@ class TruthScorer:
         that list is reused for every claim (caller-controlled grounding). When
         omitted, retrieval runs **per claim**.
         """
+        return self._score(question, answer, evidence, {})
+
+    def score_batch(
+        self,
+        questions: Sequence[str],
+        answers: Sequence[str],
+        evidence: Optional[list] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Score several ``(question, answer)`` pairs; results are in input order.
+
+        Equivalent to calling ``score`` per pair, except that retrieval is shared
+        across the batch: a claim occurring in several answers is retrieved once.
+        """
+        if len(questions) != len(answers):
+            raise ValueError(
+                f"questions and answers must have the same length, got "
+                f"{len(questions)} and {len(answers)}"
+            )
+        retrieved: Dict[str, List[Dict[str, Any]]] = {}
+        return [
+            self._score(question, answer, evidence, retrieved)
+            for question, answer in zip(questions, answers)
+        ]
+
+    def _retrieve(
+        self, claim: str, retrieved: Dict[str, List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        docs = retrieved.get(claim)
+        if docs is None:
+            docs = self._retriever.retrieve(claim, self.config.top_k)
+            retrieved[claim] = docs
+        return list(docs)
+
+    def _score(
+        self,
+        question: str,
+        answer: str,
+        evidence: Optional[list],
+        retrieved: Dict[str, List[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
         try:
             claims = self._claim_extractor(
                 question, answer, self.config.claim_min_words
@@ -103,7 +144,7 @@ class TruthScorer:
             if evidence is not None:
                 docs = list(evidence)
             else:
-                docs = self._retriever.retrieve(claim, self.config.top_k)
+                docs = self._retrieve(claim, retrieved)
             rec = self._verifier.verify(claim, docs, question=question)
             # Preserve full retrieval set for coverage / audit
             rec.evidence = docs